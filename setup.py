@@ -7,9 +7,11 @@ setup(
     install_requires=[
         "pandas>=1.5.0",
         "numpy>=1.21.0",
+        "scipy>=1.7.0",
         "scikit-learn>=1.0.0",
         "lightgbm>=3.3.0",
         "pyyaml>=6.0.0",
+        "pyarrow>=8.0.0",
     ],
     python_requires=">=3.8",
     author="Your Name",
@@ -1,3 +1,4 @@
 from .data_processor import DataProcessor
+from .shared_features import SharedFeatureMatrix
 
-__all__ = ['DataProcessor'] 
\ No newline at end of file
+__all__ = ['DataProcessor', 'SharedFeatureMatrix'] 
\ No newline at end of file
@@ -1,13 +1,18 @@
+import json
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 from pathlib import Path
 from ..features.feature_engineer import FeatureEngineer
+from ..utils.config import DataConfig, TrainingConfig
 from ..utils.logger import setup_logger
 
 class DataProcessor:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.data_config = DataConfig.from_dict(config['data'])
+        self.training_config = TrainingConfig.from_dict(config.get('training') or {})
+        self.target_column = self.data_config.target_column
         self.feature_engineer = FeatureEngineer(config)
         self.logger = setup_logger('data_processor')
     
@@ -16,13 +21,13 @@ class DataProcessor:
         try:
             if prediction_mode:
                 # For prediction, we only need test data
-                test_df = pd.read_csv(self.config['data']['test_path'])
+                test_df = pd.read_csv(self.data_config.test_path)
                 self.logger.info(f"Loaded {len(test_df)} test samples")
                 return pd.DataFrame(), test_df  # Return empty DataFrame for train
             else:
                 # For training, we need both train and test data
-                train_df = pd.read_csv(self.config['data']['train_path'])
-                test_df = pd.read_csv(self.config['data']['test_path'])
+                train_df = pd.read_csv(self.data_config.train_path)
+                test_df = pd.read_csv(self.data_config.test_path)
                 self.logger.info(f"Loaded {len(train_df)} training samples and {len(test_df)} test samples")
                 return train_df, test_df
         except Exception as e:
@@ -44,10 +49,10 @@ class DataProcessor:
         self.logger.info("Preprocessing data")
         try:
             # Handle NaN values in target column
-            if is_training and self.config['data']['target_column'] in df.columns:
-                if df[self.config['data']['target_column']].isna().any():
-                    self.logger.warning(f"Found {df[self.config['data']['target_column']].isna().sum()} NaN values in target column")
-                    df = df.dropna(subset=[self.config['data']['target_column']])
+            if is_training and self.target_column in df.columns:
+                if df[self.target_column].isna().any():
+                    self.logger.warning(f"Found {df[self.target_column].isna().sum()} NaN values in target column")
+                    df = df.dropna(subset=[self.target_column])
             
             # Fill NaN values in features
             for col in self.feature_engineer.get_feature_columns():
@@ -68,7 +73,10 @@ class DataProcessor:
     def split_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         self.logger.info("Splitting data into train and validation sets")
         try:
-            train_size = int(len(df) * (1 - self.config['training']['test_size']))
+            if 'date' in df.columns:
+                # Cut on time rather than on CSV row order
+                df = df.sort_values('date', kind='mergesort')
+            train_size = int(len(df) * (1 - self.training_config.test_size))
             train_df = df[:train_size]
             val_df = df[train_size:]
             self.logger.info(f"Split data into {len(train_df)} training and {len(val_df)} validation samples")
@@ -99,4 +107,53 @@ class DataProcessor:
             return train_df, val_df, test_df
         except Exception as e:
             self.logger.error(f"Error in data preparation pipeline: {str(e)}")
-            raise RuntimeError(f"Failed to prepare data: {str(e)}") 
\ No newline at end of file
+            raise RuntimeError(f"Failed to prepare data: {str(e)}") 
+    
+    def collect_categories(self, path: str, chunk_size: int) -> Dict[str, List[Any]]:
+        self.logger.info(f"Collecting categorical levels from {path}")
+        try:
+            levels = {feature: set() for feature in self.feature_engineer.categorical_features}
+            for chunk in pd.read_csv(path, usecols=list(levels), chunksize=chunk_size):
+                for feature in levels:
+                    levels[feature].update(chunk[feature].dropna().unique().tolist())
+            return {feature: sorted(values) for feature, values in levels.items()}
+        except Exception as e:
+            self.logger.error(f"Error collecting categorical levels: {str(e)}")
+            raise RuntimeError(f"Failed to collect categorical levels: {str(e)}")
+    
+    def write_feature_shards(self, path: str, output_dir: str, chunk_size: int) -> Dict[str, Any]:
+        self.logger.info(f"Writing feature shards from {path} to {output_dir}")
+        try:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            categories = self.collect_categories(path, chunk_size)
+            
+            shards = []
+            for i, chunk in enumerate(pd.read_csv(path, chunksize=chunk_size)):
+                chunk = self.create_time_features(chunk)
+                chunk = self.preprocess_data(chunk, is_training=True)
+                features_file = f"features_{i:05d}.npy"
+                label_file = f"label_{i:05d}.npy"
+                np.save(output_dir / features_file, self.feature_engineer.to_matrix(chunk, categories))
+                np.save(output_dir / label_file, chunk[self.target_column].to_numpy(dtype=np.float32))
+                shard = {'features': features_file, 'label': label_file, 'rows': len(chunk)}
+                if 'date' in chunk.columns and len(chunk):
+                    # Lets training order shards in time and pick a date cutoff for validation
+                    shard['date_min'] = chunk['date'].min().date().isoformat()
+                    shard['date_max'] = chunk['date'].max().date().isoformat()
+                shards.append(shard)
+            
+            meta = {
+                'feature_names': self.feature_engineer.get_feature_columns(),
+                'categorical_features': self.feature_engineer.categorical_features,
+                'categories': categories,
+                'shards': shards,
+                'n_rows': sum(shard['rows'] for shard in shards)
+            }
+            with open(output_dir / 'meta.json', 'w') as f:
+                json.dump(meta, f, indent=2)
+            self.logger.info(f"Wrote {len(shards)} shards with {meta['n_rows']} rows")
+            return meta
+        except Exception as e:
+            self.logger.error(f"Error writing feature shards: {str(e)}")
+            raise RuntimeError(f"Failed to write feature shards: {str(e)}")
@@ -0,0 +1,149 @@
+import uuid
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from ..features.feature_engineer import FeatureEngineer
+
+BACKENDS = ('shared_memory', 'memmap')
+
+# Set in each worker process by init_worker
+_WORKER_MATRIX: Optional['SharedFeatureMatrix'] = None
+
+class SharedFeatureMatrix:
+    def __init__(
+        self,
+        backend: str,
+        arrays: Dict[str, np.ndarray],
+        locations: Dict[str, str],
+        blocks: List[shared_memory.SharedMemory],
+        owner: bool
+    ):
+        self.backend = backend
+        self.arrays = arrays
+        self.locations = locations
+        self.blocks = blocks
+        self.owner = owner
+    
+    @classmethod
+    def publish(
+        cls,
+        arrays: Dict[str, np.ndarray],
+        backend: str = 'shared_memory',
+        directory: Optional[str] = None
+    ) -> 'SharedFeatureMatrix':
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown shared matrix backend: {backend}")
+        if backend == 'memmap' and directory is None:
+            raise ValueError("A directory is required for the memmap backend")
+        for name, array in arrays.items():
+            # Object arrays hold pointers into the publishing process's heap
+            if np.asarray(array).dtype.hasobject:
+                raise ValueError(f"Array '{name}' has object dtype and cannot be shared")
+        
+        shared_arrays = {}
+        locations = {}
+        blocks = []
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if backend == 'shared_memory':
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                blocks.append(block)
+                locations[name] = block.name
+            else:
+                path = Path(directory) / f"{name}_{uuid.uuid4().hex}.npy"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shared = np.lib.format.open_memmap(path, mode='w+', dtype=array.dtype, shape=array.shape)
+                locations[name] = str(path)
+            shared[...] = array
+            shared_arrays[name] = shared
+        return cls(backend, shared_arrays, locations, blocks, owner=True)
+    
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        feature_engineer: FeatureEngineer,
+        target_column: Optional[str] = None,
+        categories: Optional[Dict[str, List[Any]]] = None,
+        backend: str = 'shared_memory',
+        directory: Optional[str] = None
+    ) -> 'SharedFeatureMatrix':
+        features = feature_engineer.to_matrix(df, categories)
+        n_time = len(feature_engineer.time_features)
+        arrays = {
+            'features': features,
+            'codes': np.nan_to_num(features[:, n_time:], nan=-1).astype(np.int32)
+        }
+        if target_column is not None and target_column in df.columns:
+            arrays['target'] = df[target_column].to_numpy(dtype=np.float32)
+        if 'date' in df.columns:
+            arrays['days'] = pd.to_datetime(df['date']).values.astype('datetime64[D]').astype(np.int64)
+        return cls.publish(arrays, backend=backend, directory=directory)
+    
+    @property
+    def handle(self) -> Dict[str, Any]:
+        # Small picklable description that workers use to attach
+        return {
+            'backend': self.backend,
+            'arrays': {
+                name: (self.locations[name], array.shape, array.dtype.str)
+                for name, array in self.arrays.items()
+            }
+        }
+    
+    @classmethod
+    def attach(cls, handle: Dict[str, Any]) -> 'SharedFeatureMatrix':
+        arrays = {}
+        locations = {}
+        blocks = []
+        for name, (location, shape, dtype) in handle['arrays'].items():
+            if handle['backend'] == 'shared_memory':
+                block = shared_memory.SharedMemory(name=location)
+                array = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=block.buf)
+                blocks.append(block)
+            else:
+                array = np.load(location, mmap_mode='r')
+            array.flags.writeable = False
+            arrays[name] = array
+            locations[name] = location
+        return cls(handle['backend'], arrays, locations, blocks, owner=False)
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+    
+    def __len__(self) -> int:
+        return len(next(iter(self.arrays.values()))) if self.arrays else 0
+    
+    def close(self) -> None:
+        # Views must be dropped before the underlying buffers can be released
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+        if self.owner:
+            for block in self.blocks:
+                block.unlink()
+            if self.backend == 'memmap':
+                for location in self.locations.values():
+                    Path(location).unlink(missing_ok=True)
+        self.blocks = []
+    
+    def __enter__(self) -> 'SharedFeatureMatrix':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def init_worker(handle: Dict[str, Any]) -> None:
+    global _WORKER_MATRIX
+    _WORKER_MATRIX = SharedFeatureMatrix.attach(handle)
+
+def get_worker_matrix() -> SharedFeatureMatrix:
+    if _WORKER_MATRIX is None:
+        raise RuntimeError("Shared feature matrix has not been attached in this process")
+    return _WORKER_MATRIX
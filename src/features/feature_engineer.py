@@ -1,14 +1,17 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from ..utils.config import FeaturesConfig
 from ..utils.logger import setup_logger
 
 class FeatureEngineer:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.time_features = config['features']['time_features']
-        self.categorical_features = config['features']['categorical_features']
+        features_config = FeaturesConfig.from_dict(config['features'])
+        self.time_features = list(features_config.time_features)
+        self.categorical_features = list(features_config.categorical_features)
+        self.feature_columns = features_config.feature_columns
         self.logger = setup_logger('feature_engineer')
     
     def create_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -55,4 +58,31 @@ class FeatureEngineer:
         return df
     
     def get_feature_columns(self) -> List[str]:
-        return self.time_features + self.categorical_features 
\ No newline at end of file
+        return list(self.feature_columns) 
+    
+    def get_categories(self, df: pd.DataFrame) -> Dict[str, List[Any]]:
+        return {
+            feature: sorted(df[feature].dropna().unique().tolist())
+            for feature in self.categorical_features
+        }
+    
+    def to_matrix(
+        self,
+        df: pd.DataFrame,
+        categories: Optional[Dict[str, List[Any]]] = None
+    ) -> np.ndarray:
+        # Categorical columns are encoded as codes against fixed levels so that
+        # matrices built from separate chunks stay consistent with each other;
+        # unknown levels become NaN, which LightGBM treats as missing.
+        columns = self.get_feature_columns()
+        matrix = np.empty((len(df), len(columns)), dtype=np.float32)
+        for i, col in enumerate(columns):
+            if col in self.categorical_features:
+                if categories is not None:
+                    codes = pd.Categorical(df[col], categories=categories[col]).codes
+                else:
+                    codes = df[col].astype('category').cat.codes.to_numpy()
+                matrix[:, i] = np.where(codes < 0, np.nan, codes)
+            else:
+                matrix[:, i] = df[col].to_numpy(dtype=np.float32)
+        return matrix
@@ -0,0 +1,143 @@
+import argparse
+import copy
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from .lightgbm_model import LightGBMModel
+from .metrics import compute_metrics
+from ..data.data_processor import DataProcessor
+from ..data.shared_features import SharedFeatureMatrix, init_worker, get_worker_matrix
+from ..features.feature_engineer import FeatureEngineer
+from ..utils.config import BacktestConfig, ConfigError, DataConfig, TrainingConfig, load_config
+from ..utils.logger import setup_logger
+
+# Populated once per worker process by _init_worker
+_WORKER_CONFIG: Dict[str, Any] = {}
+
+def _init_worker(handle: Dict[str, Any], config: Dict[str, Any]) -> None:
+    init_worker(handle)
+    _WORKER_CONFIG.update(config)
+
+def _run_origin(origin_day: int, horizon_days: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    matrix = get_worker_matrix()
+    days = matrix['days']
+    
+    # Early stopping uses the window just before the origin so the forecast
+    # window is never seen during training
+    train_mask = days < origin_day - horizon_days
+    val_mask = (days >= origin_day - horizon_days) & (days < origin_day)
+    test_mask = (days >= origin_day) & (days < origin_day + horizon_days)
+    
+    X, y = matrix['features'], matrix['target']
+    model = LightGBMModel(_WORKER_CONFIG)
+    model.train_arrays(X[train_mask], y[train_mask], X[val_mask], y[val_mask])
+    predictions = model.target_transform.inverse(
+        model.model.predict(X[test_mask], num_iteration=model.model.best_iteration)
+    )
+    
+    result = {
+        'origin': str(np.datetime64(origin_day, 'D')),
+        'train_rows': int(train_mask.sum()),
+        'test_rows': int(test_mask.sum()),
+        'best_iteration': model.model.best_iteration
+    }
+    result.update(compute_metrics(y[test_mask], predictions))
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+class Backtester:
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        backtest_config = BacktestConfig.from_dict(config.get('backtest') or {})
+        self.n_origins = backtest_config.n_origins
+        self.horizon_days = backtest_config.horizon_days
+        self.step_days = backtest_config.step_days or self.horizon_days
+        self.n_jobs = backtest_config.n_jobs
+        self.threads_per_worker = backtest_config.threads_per_worker
+        self.target_column = DataConfig.from_dict(config['data']).target_column
+        self.feature_engineer = FeatureEngineer(config)
+        self.logger = setup_logger('backtester')
+    
+    def make_origins(self, dates: pd.Series) -> List[int]:
+        days = dates.values.astype('datetime64[D]').astype(np.int64)
+        first_day, last_day = days.min(), days.max()
+        last_origin = last_day - self.horizon_days + 1
+        origins = [last_origin - k * self.step_days for k in reversed(range(self.n_origins))]
+        # Each origin needs a training window and an early-stopping window before it
+        return [int(origin) for origin in origins if origin - self.horizon_days > first_day]
+    
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.logger.info("Starting walk-forward backtest")
+        try:
+            origins = self.make_origins(df['date'])
+            if not origins:
+                raise ValueError("History is too short for the configured origins and horizon")
+            
+            worker_config = copy.deepcopy(self.config)
+            worker_config['model']['params']['num_threads'] = self.threads_per_worker
+            # Folds train concurrently, so they share no checkpoint and keep their thread share
+            training = worker_config.setdefault('training', {}) or {}
+            training['budget'] = dict(
+                training.get('budget') or {},
+                num_threads=self.threads_per_worker,
+                checkpoint_dir=None,
+                resume=False
+            )
+            worker_config['training'] = training
+            with SharedFeatureMatrix.from_frame(
+                df,
+                self.feature_engineer,
+                target_column=self.target_column
+            ) as matrix:
+                self.logger.info(f"Evaluating {len(origins)} origins with {self.n_jobs} workers")
+                with ProcessPoolExecutor(
+                    max_workers=self.n_jobs,
+                    initializer=_init_worker,
+                    initargs=(matrix.handle, worker_config)
+                ) as pool:
+                    futures = [pool.submit(_run_origin, origin, self.horizon_days) for origin in origins]
+                    results = [future.result() for future in futures]
+            
+            table = pd.DataFrame(results)
+            self.logger.info(f"Backtest completed. Mean MAPE across origins: {table['mape'].mean():.2f}%")
+            return table
+        except Exception as e:
+            self.logger.error(f"Error during backtest: {str(e)}")
+            raise RuntimeError(f"Failed to run backtest: {str(e)}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backtest the sticker sales model over rolling origins")
+    parser.add_argument('--config', default="configs/train_config.yaml", help="Path to the YAML config")
+    parser.add_argument('overrides', nargs='*', help="Config overrides such as backtest.n_origins=4")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    logger = setup_logger('main')
+    logger.info("Starting backtest process")
+    
+    try:
+        args = parse_args(argv)
+        config = load_config(args.config, args.overrides)
+        data_processor = DataProcessor(config)
+        train_df, _ = data_processor.load_data()
+        train_df = data_processor.create_time_features(train_df)
+        train_df = data_processor.preprocess_data(train_df, is_training=True)
+        
+        table = Backtester(config).run(train_df)
+        output_path = Path(TrainingConfig.from_dict(config.get('training') or {}).output_dir) / "backtest.csv"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        table.to_csv(output_path, index=False)
+        logger.info(f"Backtest results saved to {output_path}")
+    except (ConfigError, FileNotFoundError) as e:
+        logger.error(f"Configuration error: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during backtest: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
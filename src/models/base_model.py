@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 
 class BaseModel(ABC):
     def __init__(self, config: Dict[str, Any]):
@@ -16,7 +17,11 @@ class BaseModel(ABC):
         pass
     
     @abstractmethod
-    def evaluate(self, data: pd.DataFrame) -> float:
+    def evaluate(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]] = None
+    ) -> float:
         pass
     
     @abstractmethod
@@ -0,0 +1,120 @@
+import json
+import math
+import os
+import time
+import lightgbm as lgb
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from ..utils.logger import setup_logger
+
+class TrainingController:
+    # Replaces lgb.early_stopping, so it runs in the same slot
+    order = 30
+    before_iteration = False
+    
+    def __init__(
+        self,
+        stages: List[Dict[str, Any]],
+        stopping_rounds: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_period: int = 50,
+        state: Optional[Dict[str, Any]] = None
+    ):
+        self.stages = stages
+        self.stopping_rounds = stopping_rounds or math.inf
+        self.deadline = time.monotonic() + max_seconds if max_seconds else None
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.checkpoint_period = checkpoint_period
+        self.logger = setup_logger('training_controller')
+        
+        state = state or {}
+        self.stage = state.get('stage', 0)
+        self.best_trees = state.get('best_trees', 0)
+        self.best_score = state.get('best_score')
+        self.best_evaluation: List[Tuple[Any, ...]] = []
+        self.stage_start = self.best_trees
+        self.rounds_since_best = 0
+        self.saved_trees = self.best_trees
+        self.stopped_by = None
+    
+    @property
+    def learning_rate(self) -> Optional[float]:
+        return self.stages[self.stage].get('learning_rate')
+    
+    def _validation_score(self, env) -> Tuple[float, bool]:
+        # First metric of the first validation set that is not the training data
+        for entry in env.evaluation_result_list:
+            if entry[0] != 'training':
+                return entry[2], entry[3]
+        raise ValueError("Training budget requires a validation set")
+    
+    def _stop(self, reason: str) -> None:
+        self.stopped_by = reason
+        self.logger.info(f"Stopping training ({reason}). Best iteration: {self.best_trees}")
+        raise lgb.callback.EarlyStopException(self.best_trees - 1, self.best_evaluation)
+    
+    def _next_stage(self, env) -> None:
+        # Drop the trees grown after the best one before refining from there
+        for _ in range(env.model.current_iteration() - self.best_trees):
+            env.model.rollback_one_iter()
+        self.stage += 1
+        self.stage_start = self.best_trees
+        self.rounds_since_best = 0
+        if self.learning_rate is not None:
+            env.model.reset_parameter({'learning_rate': self.learning_rate})
+        self.logger.info(
+            f"Moving to training stage {self.stage + 1}/{len(self.stages)} "
+            f"at iteration {self.best_trees} with learning rate {self.learning_rate}"
+        )
+    
+    def __call__(self, env) -> None:
+        score, higher_better = self._validation_score(env)
+        trees = env.model.current_iteration()
+        if self.best_score is None or (score > self.best_score if higher_better else score < self.best_score):
+            self.best_score = score
+            self.best_trees = trees
+            self.best_evaluation = [entry[:4] for entry in env.evaluation_result_list]
+            self.rounds_since_best = 0
+        else:
+            self.rounds_since_best += 1
+        
+        if self.checkpoint_dir is not None and (env.iteration + 1) % self.checkpoint_period == 0:
+            self.save_checkpoint(env.model)
+        
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self._stop("wall time budget exhausted")
+        
+        stage_rounds = self.stages[self.stage].get('rounds')
+        stage_done = stage_rounds is not None and trees - self.stage_start >= stage_rounds
+        if self.rounds_since_best >= self.stopping_rounds or stage_done:
+            if self.stage + 1 < len(self.stages):
+                self._next_stage(env)
+            else:
+                self._stop("early stopping")
+    
+    def save_checkpoint(self, booster: lgb.Booster) -> None:
+        if self.best_trees == self.saved_trees or self.best_trees == 0:
+            return
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        model_path = self.checkpoint_dir / 'checkpoint.txt'
+        tmp_path = self.checkpoint_dir / 'checkpoint.txt.tmp'
+        booster.save_model(str(tmp_path), num_iteration=self.best_trees)
+        os.replace(tmp_path, model_path)
+        with open(self.checkpoint_dir / 'checkpoint.json', 'w') as f:
+            json.dump({'stage': self.stage, 'best_trees': self.best_trees, 'best_score': self.best_score}, f)
+        self.saved_trees = self.best_trees
+        self.logger.info(f"Saved checkpoint at iteration {self.best_trees}")
+
+def load_checkpoint(checkpoint_dir: str) -> Tuple[Optional[lgb.Booster], Optional[Dict[str, Any]]]:
+    model_path = Path(checkpoint_dir) / 'checkpoint.txt'
+    state_path = Path(checkpoint_dir) / 'checkpoint.json'
+    if not model_path.exists() or not state_path.exists():
+        return None, None
+    with open(state_path, 'r') as f:
+        state = json.load(f)
+    return lgb.Booster(model_file=str(model_path)), state
+
+def clear_checkpoint(checkpoint_dir: str) -> None:
+    for name in ('checkpoint.txt', 'checkpoint.json'):
+        (Path(checkpoint_dir) / name).unlink(missing_ok=True)
@@ -0,0 +1,130 @@
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from .lightgbm_model import LightGBMModel
+from .model_factory import ModelFactory
+from .registry import resolve_model_path
+from ..data.data_processor import DataProcessor
+from ..utils.config import ConfigError, Config, ExplainConfig, load_config
+from ..utils.logger import setup_logger
+
+class ModelExplainer:
+    def __init__(self, config: Dict[str, Any], model: LightGBMModel):
+        self.config = config
+        explain_config = ExplainConfig.from_dict(config.get('explain') or {})
+        self.chunk_size = explain_config.chunk_size
+        self.group_columns = list(explain_config.group_columns)
+        self.write_rows = explain_config.write_rows
+        self.output_dir = Path(explain_config.output_dir)
+        self.model = model
+        self.logger = setup_logger('model_explainer')
+    
+    def _group_sums(self, chunk: pd.DataFrame, contributions: np.ndarray, column: str) -> pd.DataFrame:
+        # Per-chunk sums are tiny, so combining them at the end is cheap
+        values = np.hstack([contributions, np.abs(contributions), np.ones((len(chunk), 1))])
+        return pd.DataFrame(values).groupby(chunk[column].astype(str).to_numpy()).sum()
+    
+    def _group_means(self, partials: List[pd.DataFrame], column: str, names: List[str]) -> pd.DataFrame:
+        combined = pd.concat(partials).groupby(level=0).sum()
+        totals = combined.to_numpy()
+        rows = totals[:, -1:]
+        n = len(names)
+        means = pd.DataFrame(
+            np.hstack([totals[:, :n] / rows, totals[:, n:2 * n] / rows]),
+            columns=[f"mean_{name}" for name in names] + [f"mean_abs_{name}" for name in names]
+        )
+        means.insert(0, column, combined.index.to_numpy())
+        means.insert(1, 'rows', rows.ravel().astype(np.int64))
+        return means
+    
+    def run(self, data: pd.DataFrame) -> Dict[str, Path]:
+        self.logger.info(f"Explaining {len(data)} rows in chunks of {self.chunk_size}")
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            paths = {'importance': self.output_dir / 'importance.parquet'}
+            importance = self.model.feature_importance()
+            importance.to_parquet(paths['importance'], index=False)
+            self.logger.info(f"Top features by gain: {', '.join(importance['feature'].head(5))}")
+            
+            partials: Dict[str, List[pd.DataFrame]] = {column: [] for column in self.group_columns}
+            names: List[str] = []
+            writer = None
+            key_columns = [column for column in ['id'] + self.group_columns if column in data.columns]
+            try:
+                for start in range(0, len(data), self.chunk_size):
+                    chunk = data.iloc[start:start + self.chunk_size]
+                    contributions = self.model.predict_contributions(chunk)
+                    names = list(contributions.columns)
+                    values = contributions.to_numpy()
+                    for column in self.group_columns:
+                        partials[column].append(self._group_sums(chunk, values, column))
+                    
+                    if self.write_rows:
+                        rows = chunk[key_columns].astype({c: str for c in self.group_columns}).reset_index(drop=True)
+                        table = pa.Table.from_pandas(
+                            pd.concat([rows, contributions.reset_index(drop=True)], axis=1),
+                            preserve_index=False
+                        )
+                        if writer is None:
+                            paths['contributions'] = self.output_dir / 'contributions.parquet'
+                            writer = pq.ParquetWriter(paths['contributions'], table.schema)
+                        writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            
+            for column in self.group_columns:
+                if not partials[column]:
+                    continue
+                paths[f"by_{column}"] = self.output_dir / f"contributions_by_{column}.parquet"
+                self._group_means(partials[column], column, names).to_parquet(paths[f"by_{column}"], index=False)
+            self.logger.info(f"Explanations saved to {self.output_dir}")
+            return paths
+        except Exception as e:
+            self.logger.error(f"Error explaining predictions: {str(e)}")
+            raise RuntimeError(f"Failed to explain predictions: {str(e)}")
+
+def explain(config: Dict[str, Any]) -> Dict[str, Path]:
+    logger = setup_logger('explainer')
+    logger.info("Starting explanation pipeline")
+    
+    try:
+        typed_config = Config.from_dict(config)
+        model = ModelFactory.create_model(config)
+        model.load(str(resolve_model_path(typed_config)))
+        
+        logger.info("Preparing data")
+        _, _, test_df = DataProcessor(config).prepare_data(prediction_mode=True)
+        return ModelExplainer(config, model).run(test_df)
+    except Exception as e:
+        logger.error(f"Error during explanation: {str(e)}")
+        raise RuntimeError(f"Failed to explain predictions: {str(e)}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Explain sticker sales predictions")
+    parser.add_argument('--config', default="configs/predict_config.yaml", help="Path to the YAML config")
+    parser.add_argument('overrides', nargs='*', help="Config overrides such as explain.chunk_size=50000")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    logger = setup_logger('main')
+    logger.info("Starting explanation process")
+    
+    try:
+        args = parse_args(argv)
+        config = load_config(args.config, args.overrides)
+        explain(config)
+        logger.info("Explanation completed successfully")
+    except (ConfigError, FileNotFoundError) as e:
+        logger.error(f"Configuration error: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during explanation: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,302 @@
+import hashlib
+import json
 import pandas as pd
 import numpy as np
 import lightgbm as lgb
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
 from .base_model import BaseModel
+from .callbacks import TrainingController, clear_checkpoint, load_checkpoint
+from ..utils.config import DataConfig, FeaturesConfig, ModelConfig, MonitoringConfig, TrainingConfig
 from ..utils.logger import setup_logger
-from sklearn.metrics import mean_absolute_percentage_error
+from ..utils.memory import peak_memory_mb
+from .metrics import compute_metrics, evaluation_report
+from .prediction_cache import PredictionCache
+from .target_transform import TargetTransformFactory, load_target_transform, save_target_transform
+from ..features.feature_engineer import FeatureEngineer
+from ..monitoring.drift import ReferenceProfile, load_reference_profile, save_reference_profile
+
+# LightGBM metric names that compute_metrics can report in the original target space
+ORIGINAL_SPACE_METRICS = {
+    'mape': 'mape',
+    'mean_absolute_percentage_error': 'mape',
+    'l1': 'mae',
+    'mae': 'mae',
+    'mean_absolute_error': 'mae',
+    'rmse': 'rmse',
+    'l2_root': 'rmse',
+    'root_mean_squared_error': 'rmse'
+}
+
+class ShardSequence(lgb.Sequence):
+    def __init__(self, path: str, batch_size: int = 65536):
+        # Memory-mapped so LightGBM only pages in the rows it is pushing
+        self.data = np.load(path, mmap_mode='r')
+        self.batch_size = batch_size
+    
+    def __getitem__(self, idx):
+        # Shards are stored as float32; LightGBM samples rows as float64
+        return np.asarray(self.data[idx], dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.data)
 
 class LightGBMModel(BaseModel):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.feature_cols = (
-            config['features']['time_features'] +
-            config['features']['categorical_features']
-        )
+        features_config = FeaturesConfig.from_dict(config['features'])
+        self.model_config = ModelConfig.from_dict(config['model'])
+        self.training_config = TrainingConfig.from_dict(config.get('training') or {})
+        self.feature_cols = features_config.feature_columns
+        self.categorical_features = list(features_config.categorical_features)
+        self.target_column = DataConfig.from_dict(config['data']).target_column
+        self.feature_engineer = FeatureEngineer(config)
+        self.target_transform = TargetTransformFactory.create(self.model_config.target_transform)
+        self.monitoring_config = MonitoringConfig.from_dict(config.get('monitoring') or {})
+        self.reference_profile: Optional[ReferenceProfile] = None
+        self.validation_metrics: Optional[Dict[str, float]] = None
+        # Untransformed validation target and per-row scale, used by the original-space feval
+        self._validation_target: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = None
+        self.prediction_cache: Optional[PredictionCache] = None
+        self._versioned_model = None
+        self._model_version: Optional[str] = None
         self.logger = setup_logger('lightgbm_model')
     
+    @property
+    def model_version(self) -> str:
+        if self.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+        # Recomputed only when the booster object is replaced
+        if self._versioned_model is not self.model:
+            model_string = self.model.model_to_string() + json.dumps(self.target_transform.to_dict(), sort_keys=True)
+            self._model_version = hashlib.sha256(model_string.encode('utf-8')).hexdigest()[:16]
+            self._versioned_model = self.model
+        return self._model_version
+    
+    def enable_prediction_cache(self, cache: PredictionCache) -> None:
+        self.prediction_cache = cache
+        if self.model is not None:
+            cache.bind(self.model_version)
+    
     def train(self, train_data: pd.DataFrame, val_data: pd.DataFrame) -> None:
         self.logger.info("Preparing LightGBM datasets")
         try:
+            self.target_transform.fit(train_data, train_data[self.target_column].to_numpy())
+            self.reference_profile = ReferenceProfile.from_frame(
+                train_data, self.feature_engineer, self.monitoring_config.n_bins
+            )
             train_dataset = lgb.Dataset(
                 train_data[self.feature_cols],
-                label=train_data[self.config['data']['target_column']]
+                label=self._forward_target(train_data, train_data[self.target_column].to_numpy())
             )
             val_dataset = lgb.Dataset(
                 val_data[self.feature_cols],
-                label=val_data[self.config['data']['target_column']],
+                label=self._forward_target(val_data, val_data[self.target_column].to_numpy()),
                 reference=train_dataset
             )
+            self._validation_target = (val_data[self.target_column].to_numpy(), self.target_transform.scale(val_data))
             
-            self.logger.info("Starting model training")
-            self.model = lgb.train(
-                params=self.config['model']['params'],
-                train_set=train_dataset,
-                num_boost_round=self.config['model']['params']['n_estimators'],
-                valid_sets=[train_dataset, val_dataset],
-                callbacks=[
-                    lgb.early_stopping(stopping_rounds=self.config['model']['params']['early_stopping_rounds']),
-                    lgb.log_evaluation(period=100)
-                ]
+            self._fit(train_dataset, val_dataset)
+        except Exception as e:
+            self.logger.error(f"Error during model training: {str(e)}")
+            raise RuntimeError(f"Failed to train model: {str(e)}")
+    
+    def train_arrays(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray,
+        y_val: np.ndarray
+    ) -> None:
+        # Columns follow self.feature_cols with categoricals already encoded as codes
+        self.logger.info("Preparing LightGBM datasets from arrays")
+        try:
+            self._require_row_transform()
+            train_dataset = lgb.Dataset(
+                X_train,
+                label=self.target_transform.forward(y_train),
+                feature_name=self.feature_cols,
+                categorical_feature=self.categorical_features
             )
-            self.logger.info(f"Model training completed. Best iteration: {self.model.best_iteration}")
+            val_dataset = lgb.Dataset(
+                X_val,
+                label=self.target_transform.forward(y_val),
+                feature_name=self.feature_cols,
+                categorical_feature=self.categorical_features,
+                reference=train_dataset
+            )
+            self._validation_target = (y_val, None)
+            
+            self._fit(train_dataset, val_dataset)
+        except Exception as e:
+            self.logger.error(f"Error during model training: {str(e)}")
+            raise RuntimeError(f"Failed to train model: {str(e)}")
+    
+    def train_from_shards(self, shard_dir: str) -> None:
+        self.logger.info(f"Preparing LightGBM datasets from shards in {shard_dir}")
+        try:
+            self._require_row_transform()
+            shard_dir = Path(shard_dir)
+            with open(shard_dir / 'meta.json', 'r') as f:
+                meta = json.load(f)
+            
+            train_shards, val_shards = self._split_shards(meta['shards'])
+            
+            self.reference_profile = ReferenceProfile.from_shards(str(shard_dir), self.monitoring_config.n_bins)
+            train_dataset = self._shard_dataset(shard_dir, train_shards, meta)
+            val_dataset = self._shard_dataset(shard_dir, val_shards, meta, reference=train_dataset)
+            val_labels = np.concatenate([np.load(shard_dir / shard['label']) for shard in val_shards])
+            self._validation_target = (val_labels, None)
+            self.logger.info(
+                f"Streaming {sum(s['rows'] for s in train_shards)} training and "
+                f"{sum(s['rows'] for s in val_shards)} validation rows"
+            )
+            
+            self._fit(train_dataset, val_dataset)
+            # Record the category levels the codes were built against so that
+            # predicting on a categorical DataFrame maps values to the same codes
+            self.model.pandas_categorical = [
+                meta['categories'][feature] for feature in meta['categorical_features']
+            ]
+            # Scored shard by shard in the original target space, like the in-memory validation report
+            raw = np.concatenate([
+                self.model.predict(np.load(shard_dir / shard['features'], mmap_mode='r')) for shard in val_shards
+            ])
+            self.validation_metrics = compute_metrics(val_labels, self.target_transform.inverse(raw))
+            self.logger.info(f"Peak memory during out-of-core training: {peak_memory_mb():.1f} MB")
         except Exception as e:
             self.logger.error(f"Error during model training: {str(e)}")
             raise RuntimeError(f"Failed to train model: {str(e)}")
     
+    def _split_shards(self, shards: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if len(shards) < 2:
+            raise ValueError("At least two shards are required to hold out a validation set")
+        if all('date_max' in shard for shard in shards):
+            # Hold out the latest shards rather than the last ones in CSV order
+            shards = sorted(shards, key=lambda shard: (shard['date_max'], shard['date_min']))
+        # Grow the holdout from the latest shard while that brings it closer to test_size of the rows
+        target_rows = sum(shard['rows'] for shard in shards) * self.training_config.test_size
+        n_val, val_rows = 1, shards[-1]['rows']
+        while n_val < len(shards) - 1:
+            extended = val_rows + shards[-n_val - 1]['rows']
+            if abs(extended - target_rows) >= abs(val_rows - target_rows):
+                break
+            n_val, val_rows = n_val + 1, extended
+        train_shards, val_shards = shards[:-n_val], shards[-n_val:]
+        if 'date_max' in val_shards[0]:
+            # Chunks of a date-sorted CSV share at most their boundary date
+            cutoff = min(shard['date_min'] for shard in val_shards)
+            overlapping = [shard for shard in train_shards if shard['date_max'] > cutoff]
+            if overlapping:
+                self.logger.warning(
+                    f"{len(overlapping)} training shards extend past the validation start {cutoff}; "
+                    "sort the training CSV by date for a clean time split"
+                )
+        return train_shards, val_shards
+    
+    def _shard_dataset(
+        self,
+        shard_dir: Path,
+        shards: List[Dict[str, Any]],
+        meta: Dict[str, Any],
+        reference: lgb.Dataset = None
+    ) -> lgb.Dataset:
+        sequences = [ShardSequence(str(shard_dir / shard['features'])) for shard in shards]
+        label = np.concatenate([np.load(shard_dir / shard['label']) for shard in shards])
+        return lgb.Dataset(
+            sequences,
+            label=self.target_transform.forward(label),
+            feature_name=meta['feature_names'],
+            categorical_feature=meta['categorical_features'],
+            reference=reference
+        )
+    
+    def _fit(self, train_dataset: lgb.Dataset, val_dataset: lgb.Dataset) -> None:
+        self.model = self._train_booster(
+            self._booster_params(),
+            train_dataset,
+            val_dataset,
+            self.training_config.budget.checkpoint_dir
+        )
+    
+    def _booster_params(self) -> Dict[str, Any]:
+        # Round and stopping limits are passed explicitly so the budget controls them
+        params = {
+            key: value for key, value in self.model_config.params.items()
+            if key not in ('n_estimators', 'early_stopping_rounds')
+        }
+        if self.training_config.budget.num_threads:
+            params['num_threads'] = self.training_config.budget.num_threads
+        return params
+    
+    def _train_booster(
+        self,
+        params: Dict[str, Any],
+        train_dataset: lgb.Dataset,
+        val_dataset: lgb.Dataset,
+        checkpoint_dir: Optional[str] = None
+    ) -> lgb.Booster:
+        budget = self.training_config.budget
+        params = dict(params)
+        max_rounds = min(self.model_config.n_estimators, budget.max_rounds or self.model_config.n_estimators)
+        stages = [dict(stage) for stage in budget.schedule] or [{'learning_rate': params.get('learning_rate')}]
+        
+        init_model, state = None, None
+        if budget.resume and checkpoint_dir:
+            init_model, state = load_checkpoint(checkpoint_dir)
+            if init_model is not None:
+                self.logger.info(f"Resuming training from checkpoint at iteration {init_model.current_iteration()}")
+        controller = TrainingController(
+            stages,
+            stopping_rounds=self.model_config.early_stopping_rounds,
+            max_seconds=budget.max_wall_time_seconds,
+            checkpoint_dir=checkpoint_dir,
+            checkpoint_period=budget.checkpoint_period,
+            state=state
+        )
+        if controller.learning_rate is not None:
+            params['learning_rate'] = controller.learning_rate
+        feval = self._original_space_feval(params, val_dataset)
+        if feval is not None:
+            params['metric'] = 'None'
+        done = init_model.current_iteration() if init_model is not None else 0
+        
+        self.logger.info("Starting model training")
+        booster = lgb.train(
+            params=params,
+            train_set=train_dataset,
+            num_boost_round=max(max_rounds - done, 0),
+            valid_sets=[train_dataset, val_dataset],
+            init_model=init_model,
+            feval=feval,
+            callbacks=[controller, lgb.log_evaluation(period=100)]
+        )
+        # Stopping on the round limit does not record the best iteration
+        if controller.best_trees:
+            booster.best_iteration = controller.best_trees
+        if checkpoint_dir:
+            clear_checkpoint(checkpoint_dir)
+        self.logger.info(f"Model training completed. Best iteration: {booster.best_iteration}")
+        return booster
+    
+    def _original_space_feval(self, params: Dict[str, Any], val_dataset: lgb.Dataset):
+        # Built-in metrics would score the transformed target, e.g. MAPE of log sales
+        if self.target_transform.name == 'none' or self._validation_target is None:
+            return None
+        metric = params.get('metric') or []
+        names = [metric] if isinstance(metric, str) else list(metric)
+        if not names or any(name not in ORIGINAL_SPACE_METRICS for name in names):
+            return None
+        y_true, scale = self._validation_target
+        
+        def feval(preds: np.ndarray, eval_data: lgb.Dataset):
+            if eval_data is not val_dataset:
+                return []
+            metrics = compute_metrics(y_true, self.target_transform.inverse(preds, scale))
+            return [(name, metrics[ORIGINAL_SPACE_METRICS[name]], False) for name in names]
+        
+        return feval
+    
     def predict(self, data: pd.DataFrame) -> pd.DataFrame:
         if self.model is None:
             self.logger.error("Model has not been trained yet")
@@ -51,7 +304,10 @@ class LightGBMModel(BaseModel):
         
         self.logger.info(f"Generating predictions for {len(data)} samples")
         try:
-            predictions = self.model.predict(data[self.feature_cols])
+            if self.prediction_cache is not None:
+                predictions = self._predict_cached(data)
+            else:
+                predictions = self._predict_values(data)
             result = pd.DataFrame({
                 'id': data['id'],
                 'num_sold': predictions
@@ -62,24 +318,124 @@ class LightGBMModel(BaseModel):
             self.logger.error(f"Error during prediction: {str(e)}")
             raise RuntimeError(f"Failed to generate predictions: {str(e)}")
     
-    def evaluate(self, data: pd.DataFrame) -> float:
+    def feature_importance(self) -> pd.DataFrame:
+        if self.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+        gain = self.model.feature_importance(importance_type='gain')
+        importance = pd.DataFrame({
+            'feature': self.model.feature_name(),
+            'gain': gain,
+            'split': self.model.feature_importance(importance_type='split')
+        })
+        importance['gain_share'] = gain / gain.sum() if gain.sum() > 0 else 0.0
+        return importance.sort_values('gain', ascending=False).reset_index(drop=True)
+    
+    def predict_contributions(self, data: pd.DataFrame) -> pd.DataFrame:
+        if self.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+        # Contributions are in the space the booster was trained in, so each row
+        # sums to the raw prediction before the target transform is inverted
+        contributions = self.model.predict(data[self.feature_cols], pred_contrib=True)
+        columns = [f"contrib_{name}" for name in self.model.feature_name()] + ['bias']
+        return pd.DataFrame(contributions, columns=columns, index=data.index)
+    
+    def _forward_target(self, data: pd.DataFrame, y: np.ndarray) -> np.ndarray:
+        return self.target_transform.forward(y, self.target_transform.scale(data))
+    
+    def _predict_values(self, data: pd.DataFrame) -> np.ndarray:
+        raw = self.model.predict(data[self.feature_cols])
+        return self.target_transform.inverse(raw, self.target_transform.scale(data))
+    
+    def _require_row_transform(self) -> None:
+        # Array and shard inputs carry no series keys to compute per-row scales
+        if self.target_transform.requires_frame:
+            raise ValueError(
+                f"Target transform {self.target_transform.name} needs DataFrame inputs; "
+                "use train() or a row-wise transform such as log1p"
+            )
+    
+    def _predict_cached(self, data: pd.DataFrame) -> np.ndarray:
+        cache = self.prediction_cache
+        cache.bind(self.model_version)
+        
+        categories = None
+        if self.model.pandas_categorical:
+            categories = dict(zip(self.categorical_features, self.model.pandas_categorical))
+        keys = cache.hash_rows(self.feature_engineer.to_matrix(data, categories))
+        predictions, hit = cache.lookup(keys)
+        
+        if not hit.all():
+            # Score each distinct missing row once
+            miss_keys, first, inverse = np.unique(keys[~hit], return_index=True, return_inverse=True)
+            miss_rows = np.flatnonzero(~hit)[first]
+            scored = self._predict_values(data.iloc[miss_rows])
+            predictions[~hit] = scored[inverse]
+            cache.insert(miss_keys, scored)
+            cache.save()
+        
+        stats = cache.stats
+        self.logger.info(
+            f"Prediction cache: {int(hit.sum())} hits, {int((~hit).sum())} misses "
+            f"(lifetime hit rate {stats['hit_rate']:.1%})"
+        )
+        return predictions
+    
+    def evaluate(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]] = None
+    ) -> float:
         if self.model is None:
             self.logger.error("Model has not been trained yet")
             raise RuntimeError("Model has not been trained yet.")
         
         self.logger.info("Evaluating model performance")
         try:
-            predictions = self.model.predict(data[self.feature_cols])
-            mape = mean_absolute_percentage_error(
-                data[self.config['data']['target_column']],
-                predictions
-            ) * 100
+            predictions = self._resolve_predictions(data, predictions)
+            mape = compute_metrics(data[self.target_column].to_numpy(), predictions)['mape']
             self.logger.info(f"Model MAPE: {mape:.2f}%")
             return mape
         except Exception as e:
             self.logger.error(f"Error during model evaluation: {str(e)}")
             raise RuntimeError(f"Failed to evaluate model: {str(e)}")
     
+    def evaluate_report(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]] = None,
+        group_columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        if self.model is None:
+            self.logger.error("Model has not been trained yet")
+            raise RuntimeError("Model has not been trained yet.")
+        
+        self.logger.info("Building evaluation report")
+        try:
+            predictions = self._resolve_predictions(data, predictions)
+            report = evaluation_report(data, predictions, self.target_column, group_columns)
+            overall = ', '.join(f"{name}={value:.4f}" for name, value in report['overall'].items())
+            self.logger.info(f"Evaluation metrics: {overall}")
+            return report
+        except Exception as e:
+            self.logger.error(f"Error building evaluation report: {str(e)}")
+            raise RuntimeError(f"Failed to build evaluation report: {str(e)}")
+    
+    def _resolve_predictions(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]]
+    ) -> np.ndarray:
+        # Callers that already scored the data pass predictions in so the
+        # booster is not run a second time
+        if predictions is None:
+            return self._predict_values(data)
+        if isinstance(predictions, pd.DataFrame):
+            predictions = predictions['num_sold']
+        predictions = np.asarray(predictions)
+        if len(predictions) != len(data):
+            raise ValueError(f"Got {len(predictions)} predictions for {len(data)} samples")
+        return predictions
+    
     def save(self, path: str) -> None:
         if self.model is None:
             self.logger.error("No model to save")
@@ -88,6 +444,12 @@ class LightGBMModel(BaseModel):
         self.logger.info(f"Saving model to {path}")
         try:
             self.model.save_model(path)
+            save_target_transform(self.target_transform, path)
+            if self.reference_profile is not None:
+                save_reference_profile(self.reference_profile, path)
+            if self.prediction_cache is not None:
+                # Entries from a previously saved model must not be served
+                self.prediction_cache.bind(self.model_version)
             self.logger.info("Model saved successfully")
         except Exception as e:
             self.logger.error(f"Error saving model: {str(e)}")
@@ -97,6 +459,13 @@ class LightGBMModel(BaseModel):
         self.logger.info(f"Loading model from {path}")
         try:
             self.model = lgb.Booster(model_file=path)
+            # The transform fitted at training time is persisted with the model
+            target_transform = load_target_transform(path)
+            if target_transform is not None:
+                self.target_transform = target_transform
+            self.reference_profile = load_reference_profile(path)
+            if self.prediction_cache is not None:
+                self.prediction_cache.bind(self.model_version)
             self.logger.info("Model loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading model: {str(e)}")
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+# Same floor sklearn's mean_absolute_percentage_error uses for zero targets
+EPSILON = np.finfo(np.float64).eps
+DEFAULT_GROUP_COLUMNS = ['country', 'store', 'product', 'month']
+
+def _error_frame(y_true: np.ndarray, y_pred: np.ndarray) -> pd.DataFrame:
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    error = y_pred - y_true
+    abs_error = np.abs(error)
+    return pd.DataFrame({
+        'ape': abs_error / np.maximum(np.abs(y_true), EPSILON),
+        'sape': 2 * abs_error / np.maximum(np.abs(y_true) + np.abs(y_pred), EPSILON),
+        'abs_error': abs_error,
+        'squared_error': error ** 2,
+        'error': error
+    })
+
+def _finalize(means: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'mape': means['ape'] * 100,
+        'smape': means['sape'] * 100,
+        'mae': means['abs_error'],
+        'rmse': np.sqrt(means['squared_error']),
+        'bias': means['error']
+    })
+
+def compute_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+    means = _error_frame(y_true, y_pred).mean().to_frame().T
+    return {name: float(value) for name, value in _finalize(means).iloc[0].items()}
+
+def _group_keys(data: pd.DataFrame, column: str) -> pd.Series:
+    if column == 'month' and 'month' not in data.columns:
+        return pd.to_datetime(data['date']).dt.month
+    return data[column]
+
+def compute_breakdowns(
+    data: pd.DataFrame,
+    y_pred: np.ndarray,
+    target_column: str,
+    group_columns: Optional[List[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    if group_columns is None:
+        group_columns = DEFAULT_GROUP_COLUMNS
+    errors = _error_frame(data[target_column].to_numpy(), y_pred)
+    
+    breakdowns = {}
+    for column in group_columns:
+        if column not in data.columns and not (column == 'month' and 'date' in data.columns):
+            continue
+        keys = _group_keys(data, column).to_numpy()
+        grouped = errors.groupby(keys, observed=True, sort=True)
+        result = _finalize(grouped.mean())
+        result.insert(0, 'count', grouped.size())
+        result.index.name = column
+        breakdowns[column] = result.reset_index()
+    return breakdowns
+
+def evaluation_report(
+    data: pd.DataFrame,
+    y_pred: np.ndarray,
+    target_column: str,
+    group_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    return {
+        'overall': compute_metrics(data[target_column].to_numpy(), y_pred),
+        'breakdowns': compute_breakdowns(data, y_pred, target_column, group_columns)
+    }
+
+def quantile_report(y_true: np.ndarray, quantile_preds: np.ndarray, quantiles: List[float]) -> Dict[str, Any]:
+    # quantile_preds has one column per quantile in ascending order
+    y_true = np.asarray(y_true, dtype=np.float64)[:, None]
+    quantile_preds = np.asarray(quantile_preds, dtype=np.float64)
+    levels = np.asarray(quantiles, dtype=np.float64)[None, :]
+    diff = y_true - quantile_preds
+    per_quantile = pd.DataFrame({
+        'quantile': levels.ravel(),
+        'coverage': (y_true <= quantile_preds).mean(axis=0),
+        'pinball_loss': np.maximum(levels * diff, (levels - 1) * diff).mean(axis=0)
+    })
+    
+    interval = {}
+    if len(quantiles) >= 2:
+        # Outermost quantiles form the reported prediction interval
+        lower, upper = quantile_preds[:, 0], quantile_preds[:, -1]
+        inside = (y_true[:, 0] >= lower) & (y_true[:, 0] <= upper)
+        interval = {
+            'nominal': float(quantiles[-1] - quantiles[0]),
+            'coverage': float(inside.mean()),
+            'mean_width': float((upper - lower).mean())
+        }
+    return {'per_quantile': per_quantile, 'interval': interval}
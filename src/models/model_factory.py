@@ -1,15 +1,18 @@
 from typing import Dict, Any
 from .base_model import BaseModel
 from .lightgbm_model import LightGBMModel
+from .quantile_model import QuantileLightGBMModel
+from ..utils.config import ModelConfig
 
 class ModelFactory:
     _models = {
-        'lightgbm': LightGBMModel
+        'lightgbm': LightGBMModel,
+        'lightgbm_quantile': QuantileLightGBMModel
     }
     
     @classmethod
     def create_model(cls, config: Dict[str, Any]) -> BaseModel:
-        model_name = config['model']['name'].lower()
+        model_name = ModelConfig.from_dict(config['model']).name
         if model_name not in cls._models:
             raise ValueError(f"Unknown model type: {model_name}")
         return cls._models[model_name](config) 
\ No newline at end of file
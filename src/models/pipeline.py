@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+from .lightgbm_model import LightGBMModel
+from ..data.data_processor import DataProcessor
+from ..monitoring.drift import DriftMonitor
+from ..utils.config import DataConfig, PredictionConfig
+from ..utils.logger import setup_logger
+
+# Sentinel passed downstream when a stage has no more chunks
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+class PredictionPipeline:
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        model: LightGBMModel,
+        data_processor: DataProcessor,
+        monitor: Optional[DriftMonitor] = None
+    ):
+        self.config = config
+        pipeline_config = PredictionConfig.from_dict(config.get('prediction') or {}).pipeline
+        self.chunk_size = pipeline_config.chunk_size
+        self.queue_size = pipeline_config.queue_size
+        self.test_path = DataConfig.from_dict(config['data']).test_path
+        self.model = model
+        self.data_processor = data_processor
+        self.monitor = monitor
+        self.logger = setup_logger('prediction_pipeline')
+        
+        self._stop = threading.Event()
+        self._errors: List[Exception] = []
+        self._stage_seconds: Dict[str, float] = {}
+        self._rows = 0
+        self._chunks = 0
+    
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        # Bounded queues give backpressure; polling lets a failed stage unblock the rest
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+    
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _DONE
+    
+    def _run_stage(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        in_q: Optional[queue.Queue],
+        out_q: Optional[queue.Queue]
+    ) -> None:
+        busy = 0.0
+        try:
+            if in_q is None:
+                # Source stage: func returns an iterator of chunks
+                iterator = iter(func(None))
+                while not self._stop.is_set():
+                    start = time.perf_counter()
+                    item = next(iterator, _DONE)
+                    busy += time.perf_counter() - start
+                    if item is _DONE:
+                        break
+                    self._put(out_q, item)
+            else:
+                while True:
+                    item = self._get(in_q)
+                    if item is _DONE:
+                        break
+                    start = time.perf_counter()
+                    result = func(item)
+                    busy += time.perf_counter() - start
+                    if out_q is not None:
+                        self._put(out_q, result)
+        except Exception as e:
+            self.logger.error(f"Error in pipeline stage {name}: {str(e)}")
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._stage_seconds[name] = busy
+            if out_q is not None:
+                self._put(out_q, _DONE)
+    
+    def _read(self, _: Any):
+        return pd.read_csv(self.test_path, chunksize=self.chunk_size)
+    
+    def _featurize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = self.data_processor.create_time_features(chunk)
+        return self.data_processor.preprocess_data(chunk, is_training=False)
+    
+    def _score(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.monitor is not None:
+            self.monitor.update(chunk)
+        return self.model.predict(chunk)
+    
+    def _write(self, predictions: pd.DataFrame) -> None:
+        first = self._chunks == 0
+        predictions.to_csv(self._output_path, mode='w' if first else 'a', header=first, index=False)
+        self._rows += len(predictions)
+        self._chunks += 1
+    
+    def run(self, output_path: str) -> Dict[str, Any]:
+        self.logger.info(f"Starting pipelined prediction from {self.test_path}")
+        start = time.perf_counter()
+        self._output_path = Path(output_path)
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        raw_q = queue.Queue(maxsize=self.queue_size)
+        features_q = queue.Queue(maxsize=self.queue_size)
+        predictions_q = queue.Queue(maxsize=self.queue_size)
+        stages = [
+            ('read', self._read, None, raw_q),
+            ('featurize', self._featurize, raw_q, features_q),
+            ('score', self._score, features_q, predictions_q),
+            ('write', self._write, predictions_q, None)
+        ]
+        threads = [
+            threading.Thread(target=self._run_stage, args=stage, name=f"pipeline-{stage[0]}", daemon=True)
+            for stage in stages
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if self._errors:
+            raise RuntimeError(f"Prediction pipeline failed: {str(self._errors[0])}")
+        
+        stats = {
+            'rows': self._rows,
+            'chunks': self._chunks,
+            'wall_seconds': time.perf_counter() - start,
+            'stage_seconds': dict(self._stage_seconds)
+        }
+        stage_summary = ', '.join(f"{name}={seconds:.2f}s" for name, seconds in stats['stage_seconds'].items())
+        self.logger.info(
+            f"Wrote {stats['rows']} predictions in {stats['chunks']} chunks to {output_path} "
+            f"in {stats['wall_seconds']:.2f}s ({stage_summary})"
+        )
+        return stats
@@ -1,68 +1,177 @@
-import yaml
+import argparse
+import json
+import pandas as pd
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
-from .lightgbm_model import LightGBMModel
+from typing import Dict, Any, List, Optional
+from .model_factory import ModelFactory
+from .pipeline import PredictionPipeline
+from .prediction_cache import PredictionCache
+from .reconciliation import HierarchyReconciler
+from .registry import ModelRegistry, ModelWatcher, resolve_model_path
+from .sharded_predict import ShardedPredictor
 from ..data.data_processor import DataProcessor
+from ..monitoring.drift import DriftMonitor, load_reference_profile
+from ..utils.config import ConfigError, Config, load_config
 from ..utils.logger import setup_logger
 
-def load_config(config_path: str) -> Dict[str, Any]:
-    logger = setup_logger('config_loader')
-    logger.info(f"Loading configuration from {config_path}")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        if not isinstance(config, dict):
-            raise ValueError("Configuration must be a dictionary")
-        logger.info("Configuration loaded successfully")
-        return config
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML configuration: {str(e)}")
-        raise ValueError(f"Invalid YAML configuration: {str(e)}")
-    except FileNotFoundError:
-        logger.error(f"Configuration file not found: {config_path}")
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-    except Exception as e:
-        logger.error(f"Error loading configuration: {str(e)}")
-        raise RuntimeError(f"Failed to load configuration: {str(e)}")
+def _reconcile(
+    config: Dict[str, Any],
+    typed_config: Config,
+    test_df: pd.DataFrame,
+    predictions: pd.DataFrame,
+    data_processor: DataProcessor,
+    logger
+) -> pd.DataFrame:
+    reconciliation_config = typed_config.reconciliation
+    reconciler = HierarchyReconciler(config)
+    if reconciliation_config.history_path is not None:
+        reconciler.fit(data_processor.create_time_features(pd.read_csv(reconciliation_config.history_path)))
+    aggregate_forecasts = None
+    if reconciliation_config.aggregate_forecasts_path is not None:
+        aggregate_forecasts = pd.read_csv(reconciliation_config.aggregate_forecasts_path)
+    hierarchy, reconciled = reconciler.reconcile_frame(
+        test_df, predictions['num_sold'].to_numpy(), aggregate_forecasts
+    )
+    predictions['num_sold'] = reconciled
+    
+    hierarchy_path = Path(reconciliation_config.output_path)
+    hierarchy_path.parent.mkdir(parents=True, exist_ok=True)
+    hierarchy.to_csv(hierarchy_path, index=False)
+    logger.info(f"Reconciled hierarchy saved to {hierarchy_path}")
+    return predictions
+
+def _write_predictions(typed_config: Config, predictions: pd.DataFrame, logger) -> None:
+    output_path = Path(typed_config.output.predictions_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    predictions.to_csv(output_path, index=False)
+    logger.info(f"Predictions saved to {output_path}")
+
+def _predict_single(
+    config: Dict[str, Any],
+    typed_config: Config,
+    model,
+    test_df: pd.DataFrame,
+    data_processor: DataProcessor,
+    logger
+) -> None:
+    logger.info("Generating predictions")
+    predictions = model.predict(test_df)
+    if model.prediction_cache is not None:
+        logger.info(f"Prediction cache stats: {model.prediction_cache.stats}")
+    
+    if typed_config.reconciliation.enabled:
+        predictions = _reconcile(config, typed_config, test_df, predictions, data_processor, logger)
+    _write_predictions(typed_config, predictions, logger)
+
+def _write_run_report(
+    typed_config: Config,
+    model_path: Path,
+    run_stats: Dict[str, Any],
+    drift: Dict[str, Any],
+    logger
+) -> None:
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'config_hash': typed_config.hash,
+        'model_path': str(model_path),
+        'mode': typed_config.prediction.mode,
+        'run': run_stats,
+        'drift': drift
+    }
+    report_path = Path(typed_config.monitoring.report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    logger.info(f"Run report with {len(drift['alerts'])} drift alerts saved to {report_path}")
 
 def predict(config: Dict[str, Any]) -> None:
     logger = setup_logger('predictor')
     logger.info("Starting prediction pipeline")
     
     try:
-        model_path = Path(config['model']['model_path'])
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model file not found: {model_path}")
-        
-        logger.info("Loading model")
-        model = LightGBMModel(config)
-        model.load(str(model_path))
+        typed_config = Config.from_dict(config)
+        logger.info(f"Config hash: {typed_config.hash}")
+        prediction_config = typed_config.prediction
+        registry_config = typed_config.registry
+        registry = ModelRegistry(registry_config.root) if registry_config.enabled else None
+        model_path = resolve_model_path(typed_config)
         
-        logger.info("Preparing data")
-        data_processor = DataProcessor(config)
-        _, _, test_df = data_processor.prepare_data(prediction_mode=True)
+        cache = None
+        if prediction_config.cache.enabled:
+            cache = PredictionCache(
+                max_entries=prediction_config.cache.max_entries,
+                cache_dir=prediction_config.cache.cache_dir
+            )
+        if prediction_config.mode == 'pipeline' and registry is not None:
+            # Long-running streams pick up newly promoted versions between chunks
+            model = ModelWatcher(registry, config, registry_config.poll_seconds, cache)
+        elif prediction_config.mode != 'sharded':
+            logger.info("Loading model")
+            model = ModelFactory.create_model(config)
+            if cache is not None:
+                model.enable_prediction_cache(cache)
+            model.load(str(model_path))
         
-        logger.info("Generating predictions")
-        predictions = model.predict(test_df)
+        monitor = None
+        if typed_config.monitoring.enabled:
+            profile = load_reference_profile(str(model_path))
+            if profile is None:
+                logger.warning(f"No reference profile stored with {model_path}; skipping drift monitoring")
+            else:
+                monitor = DriftMonitor(profile, typed_config.monitoring)
         
-        output_path = Path(config['output']['predictions_path'])
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        predictions.to_csv(output_path, index=False)
-        logger.info(f"Predictions saved to {output_path}")
+        data_processor = DataProcessor(config)
+        run_stats: Dict[str, Any] = {}
+        if prediction_config.mode == 'pipeline':
+            logger.info("Generating pipelined predictions")
+            pipeline = PredictionPipeline(config, model, data_processor, monitor=monitor)
+            run_stats = pipeline.run(typed_config.output.predictions_path)
+        else:
+            logger.info("Preparing data")
+            _, _, test_df = data_processor.prepare_data(prediction_mode=True)
+            if monitor is not None:
+                monitor.update(test_df)
+            
+            if prediction_config.mode == 'sharded':
+                logger.info("Generating sharded predictions")
+                predictor = ShardedPredictor(config)
+                paths = predictor.run(str(model_path), test_df)
+                if typed_config.reconciliation.enabled:
+                    # Shards hold base forecasts; the reconciled set is gathered and written as CSV
+                    predictions = _reconcile(
+                        config, typed_config, test_df, predictor.read_shards(paths), data_processor, logger
+                    )
+                    _write_predictions(typed_config, predictions, logger)
+                elif prediction_config.merge_csv:
+                    predictor.merge_to_csv(paths, typed_config.output.predictions_path)
+            else:
+                _predict_single(config, typed_config, model, test_df, data_processor, logger)
+            run_stats = {'rows': len(test_df)}
         
+        if monitor is not None:
+            _write_run_report(typed_config, model_path, run_stats, monitor.report(), logger)
+    
     except Exception as e:
         logger.error(f"Error during prediction: {str(e)}")
         raise RuntimeError(f"Failed to generate predictions: {str(e)}")
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate sticker sales predictions")
+    parser.add_argument('--config', default="configs/predict_config.yaml", help="Path to the YAML config")
+    parser.add_argument('overrides', nargs='*', help="Config overrides such as prediction.mode=sharded")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     logger = setup_logger('main')
     logger.info("Starting prediction process")
     
     try:
-        config = load_config("configs/predict_config.yaml")
+        args = parse_args(argv)
+        config = load_config(args.config, args.overrides)
         predict(config)
         logger.info("Prediction completed successfully")
-    except (ValueError, FileNotFoundError) as e:
+    except (ConfigError, FileNotFoundError) as e:
         logger.error(f"Configuration error: {str(e)}")
         raise
     except Exception as e:
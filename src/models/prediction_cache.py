@@ -0,0 +1,100 @@
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from ..utils.logger import setup_logger
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 1000000, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.logger = setup_logger('prediction_cache')
+        self._reset()
+    
+    def _reset(self) -> None:
+        # Entries are kept sorted by key so lookups are a single searchsorted
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.values = np.empty(0, dtype=np.float64)
+        self.last_used = np.empty(0, dtype=np.int64)
+        self.tick = 0
+    
+    def _path(self, version: str) -> Path:
+        return self.cache_dir / f"{version}.npz"
+    
+    def bind(self, version: str) -> None:
+        if version == self.version:
+            return
+        self.logger.info(f"Binding prediction cache to model version {version}")
+        self._reset()
+        self.version = version
+        if self.cache_dir is None:
+            return
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.cache_dir.glob('*.npz'):
+            if stale != self._path(version):
+                stale.unlink()
+        if self._path(version).exists():
+            with np.load(self._path(version)) as stored:
+                self.keys = stored['keys']
+                self.values = stored['values']
+                self.last_used = stored['last_used']
+                self.tick = int(self.last_used.max()) if len(self.last_used) else 0
+            self.logger.info(f"Loaded {len(self.keys)} cached predictions")
+    
+    @staticmethod
+    def hash_rows(matrix: np.ndarray) -> np.ndarray:
+        return pd.util.hash_pandas_object(pd.DataFrame(matrix), index=False).to_numpy()
+    
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.full(len(keys), np.nan)
+        if len(self.keys) == 0:
+            hit = np.zeros(len(keys), dtype=bool)
+        else:
+            positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            hit = self.keys[positions] == keys
+            values[hit] = self.values[positions[hit]]
+            self.tick += 1
+            self.last_used[positions[hit]] = self.tick
+        
+        n_hits = int(hit.sum())
+        self.hits += n_hits
+        self.misses += len(keys) - n_hits
+        return values, hit
+    
+    def insert(self, keys: np.ndarray, values: np.ndarray) -> None:
+        self.tick += 1
+        keys = np.concatenate([self.keys, keys])
+        values = np.concatenate([self.values, values])
+        last_used = np.concatenate([self.last_used, np.full(len(keys) - len(self.keys), self.tick)])
+        
+        keys, index = np.unique(keys, return_index=True)
+        values, last_used = values[index], last_used[index]
+        if len(keys) > self.max_entries:
+            # Evict the least recently used entries
+            keep = np.sort(np.argpartition(last_used, len(keys) - self.max_entries)[-self.max_entries:])
+            keys, values, last_used = keys[keep], values[keep], last_used[keep]
+        self.keys, self.values, self.last_used = keys, values, last_used
+    
+    def save(self) -> None:
+        if self.cache_dir is None or self.version is None:
+            return
+        path = self._path(self.version)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, keys=self.keys, values=self.values, last_used=self.last_used)
+        os.replace(tmp_path, path)
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'version': self.version,
+            'entries': len(self.keys),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+from .lightgbm_model import LightGBMModel
+from .metrics import quantile_report
+from .prediction_cache import PredictionCache
+from ..utils.logger import setup_logger
+
+def quantile_column(quantile: float) -> str:
+    return f"p{quantile * 100:g}"
+
+def quantiles_path(model_path: str) -> Path:
+    return Path(f"{model_path}.quantiles.json")
+
+class QuantileLightGBMModel(LightGBMModel):
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.quantiles: List[float] = list(self.model_config.quantiles)
+        self.boosters: Dict[float, lgb.Booster] = {}
+        self.logger = setup_logger('quantile_model')
+    
+    @property
+    def point_quantile(self) -> float:
+        # The quantile closest to the median doubles as the point forecast
+        return min(self.quantiles, key=lambda q: abs(q - 0.5))
+    
+    @property
+    def quantile_columns(self) -> List[str]:
+        return [f"{self.target_column}_{quantile_column(q)}" for q in self.quantiles]
+    
+    @property
+    def model_version(self) -> str:
+        if self.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+        if self._versioned_model is not self.model:
+            digest = hashlib.sha256()
+            for q in self.quantiles:
+                digest.update(f"{q}:".encode('utf-8'))
+                digest.update(self.boosters[q].model_to_string().encode('utf-8'))
+            digest.update(json.dumps(self.target_transform.to_dict(), sort_keys=True).encode('utf-8'))
+            self._model_version = digest.hexdigest()[:16]
+            self._versioned_model = self.model
+        return self._model_version
+    
+    def enable_prediction_cache(self, cache: PredictionCache) -> None:
+        # The cache stores one value per row, which cannot hold a set of quantiles
+        self.logger.warning("Prediction cache is not supported for quantile models; scoring without it")
+    
+    def _fit(self, train_dataset: lgb.Dataset, val_dataset: lgb.Dataset) -> None:
+        params = self._booster_params()
+        threads = params.get('num_threads') or os.cpu_count() or 1
+        threads_per_booster = max(1, threads // len(self.quantiles))
+        
+        # Bin the features once; every quantile booster trains on the same Dataset handles
+        for dataset in (train_dataset, val_dataset):
+            dataset.params = dict(params, **(dataset.params or {}))
+        train_dataset.construct()
+        val_dataset.construct()
+        
+        checkpoint_dir = self.training_config.budget.checkpoint_dir
+        
+        def fit_quantile(q: float):
+            quantile_params = dict(params, objective='quantile', alpha=q, metric='quantile', num_threads=threads_per_booster)
+            quantile_checkpoint = str(Path(checkpoint_dir) / quantile_column(q)) if checkpoint_dir else None
+            return q, self._train_booster(quantile_params, train_dataset, val_dataset, quantile_checkpoint)
+        
+        self.logger.info(
+            f"Training {len(self.quantiles)} quantile boosters concurrently "
+            f"with {threads_per_booster} threads each"
+        )
+        with ThreadPoolExecutor(max_workers=len(self.quantiles)) as executor:
+            self.boosters = dict(executor.map(fit_quantile, self.quantiles))
+        self.model = self.boosters[self.point_quantile]
+    
+    def predict_quantiles(self, data: pd.DataFrame) -> np.ndarray:
+        if self.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+        # Encode once and score every booster on the same matrix
+        categories = None
+        if self.model.pandas_categorical:
+            categories = dict(zip(self.categorical_features, self.model.pandas_categorical))
+        matrix = self.feature_engineer.to_matrix(data, categories)
+        raw = np.column_stack([self.boosters[q].predict(matrix) for q in self.quantiles])
+        scale = self.target_transform.scale(data)
+        # Monotone target transforms map quantiles to quantiles
+        values = self.target_transform.inverse(raw, None if scale is None else scale[:, None])
+        # Independently trained quantiles can cross; sorting each row restores the order
+        return np.sort(values, axis=1)
+    
+    def predict(self, data: pd.DataFrame) -> pd.DataFrame:
+        if self.model is None:
+            self.logger.error("Model has not been trained yet")
+            raise RuntimeError("Model has not been trained yet.")
+        
+        self.logger.info(f"Generating quantile predictions for {len(data)} samples")
+        try:
+            values = self.predict_quantiles(data)
+            result = pd.DataFrame({
+                'id': data['id'],
+                'num_sold': values[:, self.quantiles.index(self.point_quantile)]
+            })
+            for i, column in enumerate(self.quantile_columns):
+                result[column] = values[:, i]
+            self.logger.info("Predictions generated successfully")
+            return result
+        except Exception as e:
+            self.logger.error(f"Error during prediction: {str(e)}")
+            raise RuntimeError(f"Failed to generate predictions: {str(e)}")
+    
+    def _predict_values(self, data: pd.DataFrame) -> np.ndarray:
+        return self.predict_quantiles(data)[:, self.quantiles.index(self.point_quantile)]
+    
+    def _resolve_quantiles(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]]
+    ) -> np.ndarray:
+        if isinstance(predictions, pd.DataFrame) and set(self.quantile_columns) <= set(predictions.columns):
+            return predictions[self.quantile_columns].to_numpy()
+        return self.predict_quantiles(data)
+    
+    def evaluate_report(
+        self,
+        data: pd.DataFrame,
+        predictions: Optional[Union[np.ndarray, pd.DataFrame]] = None,
+        group_columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        if self.model is None:
+            self.logger.error("Model has not been trained yet")
+            raise RuntimeError("Model has not been trained yet.")
+        
+        try:
+            values = self._resolve_quantiles(data, predictions)
+            point = values[:, self.quantiles.index(self.point_quantile)]
+            report = super().evaluate_report(data, point, group_columns)
+            report['quantiles'] = quantile_report(data[self.target_column].to_numpy(), values, self.quantiles)
+            interval = report['quantiles']['interval']
+            if interval:
+                self.logger.info(
+                    f"Interval coverage {interval['coverage']:.1%} "
+                    f"(nominal {interval['nominal']:.1%}), mean width {interval['mean_width']:.2f}"
+                )
+            return report
+        except Exception as e:
+            self.logger.error(f"Error building evaluation report: {str(e)}")
+            raise RuntimeError(f"Failed to build evaluation report: {str(e)}")
+    
+    def save(self, path: str) -> None:
+        # The point booster stays at path so point-forecast consumers keep working
+        super().save(path)
+        try:
+            for q in self.quantiles:
+                self.boosters[q].save_model(f"{path}.{quantile_column(q)}")
+            with open(quantiles_path(path), 'w') as f:
+                json.dump({'quantiles': self.quantiles}, f)
+        except Exception as e:
+            self.logger.error(f"Error saving model: {str(e)}")
+            raise RuntimeError(f"Failed to save model: {str(e)}")
+    
+    def load(self, path: str) -> None:
+        super().load(path)
+        try:
+            with open(quantiles_path(path), 'r') as f:
+                self.quantiles = json.load(f)['quantiles']
+            self.boosters = {
+                q: lgb.Booster(model_file=f"{path}.{quantile_column(q)}") for q in self.quantiles
+            }
+            self.boosters[self.point_quantile] = self.model
+        except Exception as e:
+            self.logger.error(f"Error loading model: {str(e)}")
+            raise RuntimeError(f"Failed to load model: {str(e)}")
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+from typing import Dict, Any, Optional, Tuple
+from ..utils.config import DataConfig, FeaturesConfig, ReconciliationConfig
+from ..utils.logger import setup_logger
+
+class HierarchyReconciler:
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        reconciliation_config = ReconciliationConfig.from_dict(config.get('reconciliation') or {})
+        self.method = reconciliation_config.method
+        self.weights = reconciliation_config.weights
+        self.levels = list(FeaturesConfig.from_dict(config['features']).categorical_features)
+        self.target_column = DataConfig.from_dict(config['data']).target_column
+        self.proportions: Optional[pd.Series] = None
+        self.series_variance: Optional[pd.Series] = None
+        self.logger = setup_logger('reconciler')
+    
+    def build_summing_matrix(self, bottom: pd.DataFrame) -> Tuple[sp.csr_matrix, pd.DataFrame]:
+        # Rows are the total, one node per value of each level, then the bottom series
+        n_bottom = len(bottom)
+        columns = np.arange(n_bottom)
+        row_blocks = [np.zeros(n_bottom, dtype=np.int64)]
+        labels = [pd.DataFrame({'level': ['total']})]
+        offset = 1
+        for level in self.levels:
+            codes, uniques = pd.factorize(bottom[level], sort=True)
+            row_blocks.append(offset + codes)
+            labels.append(pd.DataFrame({'level': level, level: uniques}))
+            offset += len(uniques)
+        row_blocks.append(offset + columns)
+        labels.append(bottom[self.levels].assign(level='bottom'))
+        
+        rows = np.concatenate(row_blocks)
+        cols = np.tile(columns, len(row_blocks))
+        summing = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(offset + n_bottom, n_bottom)
+        )
+        nodes = pd.concat(labels, ignore_index=True)[['level'] + self.levels]
+        return summing, nodes
+    
+    def pivot(self, data: pd.DataFrame, values: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+        series_codes = data.groupby(self.levels, observed=True, sort=True).ngroup().to_numpy()
+        bottom = (
+            data[self.levels]
+            .assign(_series=series_codes)
+            .drop_duplicates('_series')
+            .sort_values('_series')[self.levels]
+            .reset_index(drop=True)
+        )
+        date_codes, dates = pd.factorize(pd.to_datetime(data['date']), sort=True)
+        matrix = np.zeros((len(bottom), len(dates)))
+        np.add.at(matrix, (series_codes, date_codes), np.asarray(values, dtype=np.float64))
+        return matrix, bottom, np.asarray(dates), series_codes, date_codes
+    
+    def fit(self, history: pd.DataFrame) -> 'HierarchyReconciler':
+        self.logger.info("Fitting reconciliation statistics from history")
+        try:
+            matrix, bottom, _, _, _ = self.pivot(history, history[self.target_column].to_numpy())
+            key = pd.MultiIndex.from_frame(bottom)
+            totals = matrix.sum(axis=1)
+            self.proportions = pd.Series(totals / totals.sum(), index=key)
+            self.series_variance = pd.Series(matrix.var(axis=1), index=key)
+            self.logger.info(f"Fitted statistics for {len(bottom)} bottom-level series")
+            return self
+        except Exception as e:
+            self.logger.error(f"Error fitting reconciler: {str(e)}")
+            raise RuntimeError(f"Failed to fit reconciler: {str(e)}")
+    
+    def _weights(self, summing: sp.csr_matrix, bottom: pd.DataFrame) -> np.ndarray:
+        if self.weights == 'ols':
+            return np.ones(summing.shape[0])
+        if self.weights == 'wls_struct':
+            return np.asarray(summing.sum(axis=1)).ravel()
+        if self.series_variance is None:
+            raise RuntimeError("wls_var weights require fit() on history first")
+        bottom_variance = self.series_variance.reindex(pd.MultiIndex.from_frame(bottom)).fillna(1.0).to_numpy()
+        # Aggregate variances assume independent bottom series
+        return np.maximum(summing @ bottom_variance, np.finfo(np.float64).eps)
+    
+    def reconcile(
+        self,
+        base_bottom: np.ndarray,
+        summing: sp.csr_matrix,
+        bottom: pd.DataFrame,
+        base_aggregates: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        n_bottom = summing.shape[1]
+        aggregation = summing[:-n_bottom]
+        bottom_up = aggregation @ base_bottom
+        if base_aggregates is None:
+            base_aggregates = bottom_up
+        else:
+            # Nodes or dates without an aggregate forecast fall back to the bottom-up sum
+            base_aggregates = np.where(np.isnan(base_aggregates), bottom_up, base_aggregates)
+        
+        if self.method == 'bottom_up':
+            reconciled_bottom = base_bottom
+        elif self.method == 'top_down':
+            if self.proportions is None:
+                raise RuntimeError("top_down reconciliation requires fit() on history first")
+            proportions = self.proportions.reindex(pd.MultiIndex.from_frame(bottom)).fillna(0.0).to_numpy()
+            reconciled_bottom = proportions[:, None] * base_aggregates[0][None, :]
+        else:
+            # MinT with diagonal W written as a projection onto the constraints
+            # C y = 0 with C = [I, -A]. Only the small aggregate-by-aggregate
+            # system is solved, so no dense bottom-by-bottom matrix is formed.
+            w = self._weights(summing, bottom)
+            w_aggregate, w_bottom = w[:-n_bottom], w[-n_bottom:]
+            system = sp.diags(w_aggregate) + aggregation @ sp.diags(w_bottom) @ aggregation.T
+            discrepancy = base_aggregates - aggregation @ base_bottom
+            multipliers = spsolve(system.tocsc(), discrepancy)
+            multipliers = multipliers.reshape(discrepancy.shape)
+            reconciled_bottom = base_bottom + w_bottom[:, None] * (aggregation.T @ multipliers)
+        
+        return summing @ reconciled_bottom
+    
+    def _node_keys(self, frame: pd.DataFrame) -> pd.Series:
+        # 'total|' for the total, '<level>|<value>' for nodes of each level
+        values = pd.Series('', index=frame.index)
+        for level in self.levels:
+            mask = frame['level'] == level
+            values[mask] = frame.loc[mask, level].astype(str)
+        return frame['level'].astype(str) + '|' + values
+    
+    def align_aggregates(self, forecasts: pd.DataFrame, nodes: pd.DataFrame, dates: np.ndarray) -> np.ndarray:
+        # Forecasts use the hierarchy output layout: level, the level's column, date and the target
+        aggregate_nodes = nodes[nodes['level'] != 'bottom']
+        node_codes = pd.Index(self._node_keys(aggregate_nodes)).get_indexer(self._node_keys(forecasts))
+        date_codes = pd.Index(pd.to_datetime(dates)).get_indexer(pd.to_datetime(forecasts['date']))
+        found = (node_codes >= 0) & (date_codes >= 0)
+        
+        base_aggregates = np.full((len(aggregate_nodes), len(dates)), np.nan)
+        base_aggregates[node_codes[found], date_codes[found]] = forecasts[self.target_column].to_numpy(dtype=np.float64)[found]
+        missing = int(np.isnan(base_aggregates).sum())
+        if missing:
+            self.logger.warning(f"{missing} aggregate node-dates have no base forecast; using bottom-up sums")
+        return base_aggregates
+    
+    def reconcile_frame(
+        self,
+        data: pd.DataFrame,
+        predictions: np.ndarray,
+        aggregate_forecasts: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        self.logger.info(f"Reconciling forecasts with method {self.method}")
+        try:
+            base_bottom, bottom, dates, series_codes, date_codes = self.pivot(data, predictions)
+            summing, nodes = self.build_summing_matrix(bottom)
+            base_aggregates = None
+            if aggregate_forecasts is not None:
+                base_aggregates = self.align_aggregates(aggregate_forecasts, nodes, dates)
+            reconciled = self.reconcile(base_bottom, summing, bottom, base_aggregates)
+            
+            n_nodes, n_dates = reconciled.shape
+            hierarchy = nodes.loc[np.repeat(np.arange(n_nodes), n_dates)].reset_index(drop=True)
+            hierarchy['date'] = np.tile(dates, n_nodes)
+            hierarchy[self.target_column] = reconciled.ravel()
+            
+            # Map reconciled bottom-level values back onto the input rows
+            row_values = reconciled[-len(bottom):][series_codes, date_codes]
+            self.logger.info(f"Reconciled {len(bottom)} series over {n_dates} dates into {n_nodes} nodes")
+            return hierarchy, row_values
+        except Exception as e:
+            self.logger.error(f"Error reconciling forecasts: {str(e)}")
+            raise RuntimeError(f"Failed to reconcile forecasts: {str(e)}")
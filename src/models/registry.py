@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from .lightgbm_model import LightGBMModel
+from .model_factory import ModelFactory
+from .prediction_cache import PredictionCache
+from ..utils.config import Config, ConfigError
+from ..utils.logger import setup_logger
+
+MODEL_FILE = 'model.pkl'
+METADATA_FILE = 'metadata.json'
+
+def data_hash(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+class ModelRegistry:
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.versions_dir = self.root / 'versions'
+        self.pointer_path = self.root / 'CURRENT'
+        self.history_path = self.root / 'history.jsonl'
+        self._pointer_stat: Optional[Tuple[int, int, int]] = None
+        self._current: Optional[str] = None
+        self.logger = setup_logger('model_registry')
+    
+    def version_dir(self, version: str) -> Path:
+        return self.versions_dir / version
+    
+    def model_path(self, version: str) -> Path:
+        return self.version_dir(version) / MODEL_FILE
+    
+    def register(self, model: LightGBMModel, metadata: Optional[Dict[str, Any]] = None) -> str:
+        # Versions are content hashes, so registering the same model twice is a no-op
+        version = model.model_version
+        final_dir = self.version_dir(version)
+        if final_dir.exists():
+            self.logger.info(f"Model version {version} is already registered")
+            return version
+        
+        self.logger.info(f"Registering model version {version}")
+        try:
+            self.versions_dir.mkdir(parents=True, exist_ok=True)
+            tmp_dir = self.versions_dir / f".tmp-{version}-{uuid.uuid4().hex}"
+            tmp_dir.mkdir()
+            try:
+                model.save(str(tmp_dir / MODEL_FILE))
+                record = dict(metadata or {})
+                record['version'] = version
+                record['created_at'] = datetime.now(timezone.utc).isoformat()
+                with open(tmp_dir / METADATA_FILE, 'w') as f:
+                    json.dump(record, f, indent=2, default=str)
+                # Readers only ever see a complete version directory
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                if not final_dir.exists():
+                    raise
+                self.logger.info(f"Model version {version} was registered concurrently")
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return version
+        except Exception as e:
+            self.logger.error(f"Error registering model: {str(e)}")
+            raise RuntimeError(f"Failed to register model: {str(e)}")
+    
+    def _set_current(self, version: str, action: str) -> None:
+        if not self.model_path(version).exists():
+            raise RuntimeError(f"Model version {version} is not registered")
+        tmp_path = self.root / f".CURRENT-{uuid.uuid4().hex}"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self.pointer_path)
+        with open(self.history_path, 'a') as f:
+            record = {'version': version, 'action': action, 'promoted_at': datetime.now(timezone.utc).isoformat()}
+            f.write(json.dumps(record) + '\n')
+    
+    def promote(self, version: str) -> None:
+        self._set_current(version, 'promote')
+        self.logger.info(f"Promoted model version {version}")
+    
+    def promotion_stack(self) -> List[str]:
+        # Replays the history; a rollback discards every version promoted after its target
+        stack: List[str] = []
+        for entry in self.history():
+            version = entry['version']
+            if entry.get('action') == 'rollback':
+                while stack and stack[-1] != version:
+                    stack.pop()
+                if not stack:
+                    stack.append(version)
+            else:
+                stack.append(version)
+        return stack
+    
+    def rollback(self) -> str:
+        current = self.current_version()
+        previous = [version for version in self.promotion_stack() if version != current]
+        if not previous:
+            raise RuntimeError("No earlier promoted version to roll back to")
+        self._set_current(previous[-1], 'rollback')
+        self.logger.info(f"Rolled back from model version {current} to {previous[-1]}")
+        return previous[-1]
+    
+    def current_version(self) -> Optional[str]:
+        # A single stat per call; the pointer is only re-read when it was replaced
+        try:
+            stat = self.pointer_path.stat()
+        except FileNotFoundError:
+            self._pointer_stat, self._current = None, None
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key != self._pointer_stat:
+            self._current = self.pointer_path.read_text().strip()
+            self._pointer_stat = key
+        return self._current
+    
+    def metadata(self, version: str) -> Dict[str, Any]:
+        with open(self.version_dir(version) / METADATA_FILE, 'r') as f:
+            return json.load(f)
+    
+    def history(self) -> List[Dict[str, Any]]:
+        if not self.history_path.exists():
+            return []
+        with open(self.history_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def list_versions(self) -> pd.DataFrame:
+        records = [
+            self.metadata(path.name)
+            for path in self.versions_dir.glob('*')
+            if not path.name.startswith('.') and (path / METADATA_FILE).exists()
+        ] if self.versions_dir.exists() else []
+        versions = pd.DataFrame(records, columns=None if records else ['version', 'created_at'])
+        return versions.sort_values('created_at').reset_index(drop=True)
+
+def resolve_model_path(config: Config) -> Path:
+    # The promoted registry version when the registry is enabled, else model.model_path
+    if config.registry.enabled:
+        registry = ModelRegistry(config.registry.root)
+        version = registry.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No promoted model in registry {config.registry.root}")
+        registry.logger.info(f"Using registered model version {version}")
+        model_path = registry.model_path(version)
+    else:
+        if config.model.model_path is None:
+            raise ConfigError("model.model_path is required when the registry is disabled")
+        model_path = Path(config.model.model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+    return model_path
+
+class ModelWatcher:
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        config: Dict[str, Any],
+        poll_seconds: float = 5.0,
+        cache: Optional[PredictionCache] = None
+    ):
+        self.registry = registry
+        self.config = config
+        self.poll_seconds = poll_seconds
+        self.cache = cache
+        self.version: Optional[str] = None
+        self._model: Optional[LightGBMModel] = None
+        self._last_poll = float('-inf')
+        self._lock = threading.Lock()
+        self.logger = setup_logger('model_watcher')
+    
+    def _load(self, version: str) -> LightGBMModel:
+        model = ModelFactory.create_model(self.config)
+        if self.cache is not None:
+            model.enable_prediction_cache(self.cache)
+        model.load(str(self.registry.model_path(version)))
+        return model
+    
+    def get(self) -> LightGBMModel:
+        now = time.monotonic()
+        if self._model is not None and now - self._last_poll < self.poll_seconds:
+            return self._model
+        with self._lock:
+            self._last_poll = now
+            version = self.registry.current_version()
+            if version is None:
+                if self._model is None:
+                    raise FileNotFoundError(f"No promoted model in registry {self.registry.root}")
+            elif version != self.version:
+                self.logger.info(f"Loading model version {version}")
+                # Swapped in one assignment; in-flight callers keep the previous model
+                self._model = self._load(version)
+                self.version = version
+            return self._model
+    
+    def predict(self, data: pd.DataFrame) -> pd.DataFrame:
+        return self.get().predict(data)
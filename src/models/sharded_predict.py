@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+from .target_transform import IdentityTransform, load_target_transform
+from ..data.shared_features import SharedFeatureMatrix, init_worker, get_worker_matrix
+from ..features.feature_engineer import FeatureEngineer
+from ..utils.config import PredictionConfig
+from ..utils.logger import setup_logger
+
+# Populated once per worker process by _init_worker
+_WORKER_STATE: Dict[str, Any] = {}
+
+def _init_worker(
+    handle: Dict[str, Any],
+    model_path: str,
+    threads_per_worker: int,
+    output_dir: str,
+    output_format: str
+) -> None:
+    init_worker(handle)
+    _WORKER_STATE['booster'] = lgb.Booster(model_file=model_path)
+    _WORKER_STATE['target_transform'] = load_target_transform(model_path) or IdentityTransform()
+    _WORKER_STATE['threads'] = threads_per_worker
+    _WORKER_STATE['output_dir'] = Path(output_dir)
+    _WORKER_STATE['output_format'] = output_format
+
+def _predict_shard(shard: Tuple[int, int, int, np.ndarray]) -> str:
+    # Ids arrive with the shard; only numeric arrays live in shared memory
+    index, start, stop, ids = shard
+    matrix = get_worker_matrix()
+    booster = _WORKER_STATE['booster']
+    predictions = booster.predict(
+        matrix['features'][start:stop],
+        num_threads=_WORKER_STATE['threads']
+    )
+    scale = matrix['scale'][start:stop] if 'scale' in matrix else None
+    predictions = _WORKER_STATE['target_transform'].inverse(predictions, scale)
+    result = pd.DataFrame({
+        'id': ids,
+        'num_sold': predictions
+    })
+    
+    output_format = _WORKER_STATE['output_format']
+    path = _WORKER_STATE['output_dir'] / f"part-{index:05d}.{output_format}"
+    if output_format == 'parquet':
+        result.to_parquet(path, index=False)
+    else:
+        result.to_feather(path)
+    return str(path)
+
+class ShardedPredictor:
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        prediction_config = PredictionConfig.from_dict(config.get('prediction') or {})
+        self.n_workers = prediction_config.n_workers
+        self.threads_per_worker = prediction_config.threads_per_worker
+        self.shard_rows = prediction_config.shard_rows
+        self.output_format = prediction_config.output_format
+        self.output_dir = Path(prediction_config.output_dir)
+        self.feature_engineer = FeatureEngineer(config)
+        self.logger = setup_logger('sharded_predictor')
+    
+    def make_shards(self, n_rows: int) -> List[Tuple[int, int, int]]:
+        starts = range(0, n_rows, self.shard_rows)
+        return [(i, start, min(start + self.shard_rows, n_rows)) for i, start in enumerate(starts)]
+    
+    def run(self, model_path: str, data: pd.DataFrame) -> List[str]:
+        self.logger.info(f"Generating sharded predictions for {len(data)} samples")
+        try:
+            # Encode categoricals against the levels the booster was trained on
+            booster = lgb.Booster(model_file=model_path)
+            categories = None
+            if booster.pandas_categorical:
+                categories = dict(zip(self.feature_engineer.categorical_features, booster.pandas_categorical))
+            
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.output_dir.glob('part-*'):
+                stale.unlink()
+            
+            arrays = {'features': self.feature_engineer.to_matrix(data, categories)}
+            # Per-row target scales need the series keys, so they are computed
+            # here and shared with the workers alongside the features
+            target_transform = load_target_transform(model_path)
+            if target_transform is not None and target_transform.requires_frame:
+                arrays['scale'] = target_transform.scale(data)
+            
+            ids = data['id'].to_numpy()
+            shards = [(index, start, stop, ids[start:stop]) for index, start, stop in self.make_shards(len(data))]
+            with SharedFeatureMatrix.publish(arrays) as matrix:
+                self.logger.info(f"Scoring {len(shards)} shards with {self.n_workers} workers")
+                with ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        matrix.handle,
+                        model_path,
+                        self.threads_per_worker,
+                        str(self.output_dir),
+                        self.output_format
+                    )
+                ) as pool:
+                    paths = list(pool.map(_predict_shard, shards))
+            
+            self.logger.info(f"Wrote {len(paths)} prediction shards to {self.output_dir}")
+            return paths
+        except Exception as e:
+            self.logger.error(f"Error during sharded prediction: {str(e)}")
+            raise RuntimeError(f"Failed to generate sharded predictions: {str(e)}")
+    
+    def _read_shard(self, path: str) -> pd.DataFrame:
+        if self.output_format == 'parquet':
+            return pd.read_parquet(path)
+        return pd.read_feather(path)
+    
+    def read_shards(self, paths: List[str]) -> pd.DataFrame:
+        # Shards are written in row order, so concatenating restores the input order
+        return pd.concat([self._read_shard(path) for path in paths], ignore_index=True)
+    
+    def merge_to_csv(self, paths: List[str], output_path: str) -> None:
+        self.logger.info(f"Merging {len(paths)} prediction shards into {output_path}")
+        try:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            for i, path in enumerate(paths):
+                shard = self._read_shard(path)
+                shard.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            self.logger.info(f"Predictions saved to {output_path}")
+        except Exception as e:
+            self.logger.error(f"Error merging prediction shards: {str(e)}")
+            raise RuntimeError(f"Failed to merge prediction shards: {str(e)}")
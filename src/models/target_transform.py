@@ -0,0 +1,170 @@
+import json
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Scales below this are treated as 1 so all-zero series invert exactly
+MIN_SCALE = 1e-9
+
+class TargetTransform(ABC):
+    name = 'none'
+    requires_frame = False
+    
+    def fit(self, data: pd.DataFrame, y: np.ndarray) -> 'TargetTransform':
+        return self
+    
+    def scale(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        return None
+    
+    @abstractmethod
+    def forward(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        pass
+    
+    @abstractmethod
+    def inverse(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        pass
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name}
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'TargetTransform':
+        return cls()
+
+class IdentityTransform(TargetTransform):
+    name = 'none'
+    
+    def forward(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.asarray(y, dtype=np.float64)
+    
+    def inverse(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.asarray(y, dtype=np.float64)
+
+class Log1pTransform(TargetTransform):
+    name = 'log1p'
+    
+    def forward(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.log1p(np.asarray(y, dtype=np.float64))
+    
+    def inverse(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.expm1(np.asarray(y, dtype=np.float64))
+
+class _ScaledTransform(TargetTransform):
+    requires_frame = True
+    
+    def __init__(self, group_columns: Optional[List[str]] = None):
+        self.group_columns = list(group_columns or [])
+        self.scales: Optional[pd.Series] = None
+        self.default_scale = 1.0
+    
+    def _keys(self, data: pd.DataFrame) -> pd.MultiIndex:
+        if not self.group_columns:
+            return pd.MultiIndex.from_arrays([np.zeros(len(data), dtype=np.int64).astype(str)], names=['_all'])
+        return pd.MultiIndex.from_frame(data[self.group_columns].astype(str))
+    
+    def scale(self, data: pd.DataFrame) -> np.ndarray:
+        if self.scales is None:
+            raise RuntimeError(f"{self.name} transform has not been fitted")
+        scale = self.scales.reindex(self._keys(data)).to_numpy(dtype=np.float64)
+        return np.where(np.isnan(scale), self.default_scale, scale)
+    
+    def forward(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.asarray(y, dtype=np.float64) / scale
+    
+    def inverse(self, y: np.ndarray, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.asarray(y, dtype=np.float64) * scale
+    
+    def _set_scales(self, scales: pd.Series) -> None:
+        if not isinstance(scales.index, pd.MultiIndex):
+            scales.index = pd.MultiIndex.from_arrays([scales.index], names=[scales.index.name])
+        scales = scales.where(scales > MIN_SCALE, 1.0)
+        self.scales = scales
+        self.default_scale = float(scales.mean()) if len(scales) else 1.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'group_columns': self.group_columns,
+            'keys': [list(key) for key in self.scales.index],
+            'scales': self.scales.tolist(),
+            'default_scale': self.default_scale
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'TargetTransform':
+        transform = cls(state['group_columns'])
+        names = transform.group_columns or ['_all']
+        index = pd.MultiIndex.from_tuples([tuple(key) for key in state['keys']], names=names)
+        transform.scales = pd.Series(state['scales'], index=index, dtype=np.float64)
+        transform.default_scale = state['default_scale']
+        return transform
+
+class SeriesMeanTransform(_ScaledTransform):
+    name = 'series_mean'
+    
+    def __init__(self, group_columns: Optional[List[str]] = None):
+        super().__init__(group_columns or ['country', 'store', 'product'])
+    
+    def fit(self, data: pd.DataFrame, y: np.ndarray) -> 'TargetTransform':
+        values = pd.Series(np.asarray(y, dtype=np.float64), index=self._keys(data))
+        self._set_scales(values.groupby(level=list(range(values.index.nlevels))).mean())
+        return self
+
+class RatioToTotalTransform(_ScaledTransform):
+    name = 'ratio_to_total'
+    
+    def __init__(self, group_columns: Optional[List[str]] = None):
+        # A single global total would only rescale the label, which changes nothing for the trees
+        super().__init__(group_columns or ['country', 'store'])
+    
+    def fit(self, data: pd.DataFrame, y: np.ndarray) -> 'TargetTransform':
+        # Scale is the mean daily total of each group, so the label becomes the
+        # row's share of its group's typical daily sales
+        keys = self._keys(data).to_frame(index=False)
+        keys['date'] = pd.to_datetime(data['date']).to_numpy()
+        keys['_y'] = np.asarray(y, dtype=np.float64)
+        group_names = list(keys.columns[:-2])
+        daily = keys.groupby(group_names + ['date'], observed=True)['_y'].sum()
+        self._set_scales(daily.groupby(level=list(range(len(group_names)))).mean())
+        return self
+
+class TargetTransformFactory:
+    _transforms = {
+        'none': IdentityTransform,
+        'log1p': Log1pTransform,
+        'series_mean': SeriesMeanTransform,
+        'ratio_to_total': RatioToTotalTransform
+    }
+    
+    @classmethod
+    def create(cls, spec: Dict[str, Any]) -> TargetTransform:
+        name = spec.get('name', 'none')
+        if name not in cls._transforms:
+            raise ValueError(f"Unknown target transform: {name}")
+        transform_cls = cls._transforms[name]
+        if issubclass(transform_cls, _ScaledTransform) and 'group_columns' in spec:
+            return transform_cls(spec['group_columns'])
+        return transform_cls()
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> TargetTransform:
+        name = state.get('name', 'none')
+        if name not in cls._transforms:
+            raise ValueError(f"Unknown target transform: {name}")
+        return cls._transforms[name].from_dict(state)
+
+def sidecar_path(model_path: str) -> Path:
+    return Path(f"{model_path}.target_transform.json")
+
+def save_target_transform(transform: TargetTransform, model_path: str) -> None:
+    with open(sidecar_path(model_path), 'w') as f:
+        json.dump(transform.to_dict(), f)
+
+def load_target_transform(model_path: str) -> Optional[TargetTransform]:
+    path = sidecar_path(model_path)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return TargetTransformFactory.from_dict(json.load(f))
@@ -1,71 +1,102 @@
-import yaml
+import argparse
+import time
 from pathlib import Path
-from typing import Dict, Any
-from .lightgbm_model import LightGBMModel
+from typing import Dict, Any, List, Optional
+from .model_factory import ModelFactory
+from .registry import ModelRegistry, data_hash
 from ..data.data_processor import DataProcessor
+from ..utils.config import ConfigError, Config, load_config
 from ..utils.logger import setup_logger
 
-class ConfigError(Exception):
-    pass
-
-def load_config(config_path: str) -> Dict[str, Any]:
-    logger = setup_logger('config_loader')
-    logger.info(f"Loading configuration from {config_path}")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        if not isinstance(config, dict):
-            raise ConfigError("Configuration must be a dictionary")
-        logger.info("Configuration loaded successfully")
-        return config
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML configuration: {str(e)}")
-        raise ConfigError(f"Invalid YAML configuration: {str(e)}")
-    except FileNotFoundError:
-        logger.error(f"Configuration file not found: {config_path}")
-        raise ConfigError(f"Configuration file not found: {config_path}")
-    except Exception as e:
-        logger.error(f"Error loading configuration: {str(e)}")
-        raise RuntimeError(f"Failed to load configuration: {str(e)}")
-
 def train_model(config: Dict[str, Any]) -> None:
     logger = setup_logger('trainer')
     logger.info("Starting model training pipeline")
     
     try:
-        logger.info("Preparing data")
+        typed_config = Config.from_dict(config)
+        logger.info(f"Config hash: {typed_config.hash}")
         data_processor = DataProcessor(config)
-        train_df, val_df, test_df = data_processor.prepare_data()
-        
         logger.info("Creating model")
-        model = LightGBMModel(config)
+        model = ModelFactory.create_model(config)
+        out_of_core = typed_config.training.out_of_core
         
-        logger.info("Training model")
-        model.train(train_df, val_df)
+        if out_of_core.enabled:
+            logger.info("Writing feature shards for out-of-core training")
+            data_processor.write_feature_shards(
+                typed_config.data.train_path,
+                out_of_core.shard_dir,
+                out_of_core.chunk_size
+            )
+            
+            logger.info("Training model from shards")
+            start = time.perf_counter()
+            model.train_from_shards(out_of_core.shard_dir)
+            training_seconds = time.perf_counter() - start
+            metrics = model.validation_metrics
+            logger.info(f"Validation MAPE: {metrics['mape']:.2f}%")
+        else:
+            logger.info("Preparing data")
+            train_df, val_df, test_df = data_processor.prepare_data()
+            
+            logger.info("Training model")
+            start = time.perf_counter()
+            model.train(train_df, val_df)
+            training_seconds = time.perf_counter() - start
+            
+            logger.info("Evaluating model")
+            val_predictions = model.predict(val_df)
+            report = model.evaluate_report(val_df, predictions=val_predictions)
+            metrics = report['overall']
+            logger.info(f"Validation MAPE: {metrics['mape']:.2f}%")
+            
+            metrics_dir = Path(typed_config.training.output_dir) / "metrics"
+            metrics_dir.mkdir(parents=True, exist_ok=True)
+            for column, breakdown in report['breakdowns'].items():
+                breakdown.to_csv(metrics_dir / f"validation_by_{column}.csv", index=False)
+            if 'quantiles' in report:
+                report['quantiles']['per_quantile'].to_csv(metrics_dir / "validation_quantiles.csv", index=False)
+                metrics = dict(metrics, interval=report['quantiles']['interval'])
+            logger.info(f"Validation breakdowns saved to {metrics_dir}")
         
-        logger.info("Evaluating model")
-        mape = model.evaluate(val_df)
-        logger.info(f"Validation MAPE: {mape:.2f}%")
+        if typed_config.registry.enabled:
+            registry = ModelRegistry(typed_config.registry.root)
+            version = registry.register(model, {
+                'config_hash': typed_config.hash,
+                'data_hash': data_hash(typed_config.data.train_path),
+                'metrics': metrics,
+                'training_seconds': training_seconds,
+                'best_iteration': model.model.best_iteration
+            })
+            if typed_config.registry.promote:
+                registry.promote(version)
+            return
         
-        output_dir = Path(config['training']['output_dir'])
+        output_dir = Path(typed_config.training.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         model_path = output_dir / "model.pkl"
         logger.info(f"Saving model to {model_path}")
         model.save(str(model_path))
-        
+    
     except Exception as e:
         logger.error(f"Error during training: {str(e)}")
         raise RuntimeError(f"Failed to train model: {str(e)}")
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the sticker sales model")
+    parser.add_argument('--config', default="configs/train_config.yaml", help="Path to the YAML config")
+    parser.add_argument('overrides', nargs='*', help="Config overrides such as model.params.learning_rate=0.05")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     logger = setup_logger('main')
     logger.info("Starting training process")
     
     try:
-        config = load_config("configs/train_config.yaml")
+        args = parse_args(argv)
+        config = load_config(args.config, args.overrides)
         train_model(config)
         logger.info("Training completed successfully")
-    except ConfigError as e:
+    except (ConfigError, FileNotFoundError) as e:
         logger.error(f"Configuration error: {str(e)}")
         raise
     except Exception as e:
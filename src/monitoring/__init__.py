@@ -0,0 +1,3 @@
+from .drift import DriftMonitor, ReferenceProfile
+
+__all__ = ['DriftMonitor', 'ReferenceProfile']
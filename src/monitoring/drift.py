@@ -0,0 +1,270 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+from ..features.feature_engineer import FeatureEngineer
+from ..utils.config import MonitoringConfig
+from ..utils.logger import setup_logger
+
+# Floor for empty bins so PSI stays finite
+MIN_SHARE = 1e-4
+# Rows sampled across all shards to place the numeric bin edges
+EDGE_SAMPLE_ROWS = 100000
+
+def _bin_numeric(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # Bin i holds values in [edges[i-1], edges[i]); NaNs are counted as missing instead
+    values = values[~np.isnan(values)]
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+def _shares(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    shares = counts / total if total else np.zeros(len(counts))
+    return np.maximum(shares, MIN_SHARE)
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    e, a = _shares(np.asarray(expected, dtype=np.float64)), _shares(np.asarray(actual, dtype=np.float64))
+    return float(np.sum((a - e) * np.log(a / e)))
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    # KS distance between the two distributions evaluated at the reference bin edges
+    expected, actual = np.asarray(expected, dtype=np.float64), np.asarray(actual, dtype=np.float64)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return 0.0
+    return float(np.max(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum())))
+
+class ReferenceProfile:
+    def __init__(
+        self,
+        numeric: Dict[str, Dict[str, Any]],
+        categorical: Dict[str, Dict[str, Any]],
+        n_rows: int,
+        date_range: Optional[List[str]] = None
+    ):
+        # numeric: {feature: {edges, counts, missing}}; categorical: {feature: {levels, counts, missing}}
+        self.numeric = numeric
+        self.categorical = categorical
+        self.n_rows = n_rows
+        self.date_range = date_range
+    
+    @classmethod
+    def from_matrices(
+        cls,
+        matrices: Iterable[np.ndarray],
+        feature_names: List[str],
+        categorical_features: List[str],
+        categories: Dict[str, List[Any]],
+        n_bins: int = 10,
+        date_range: Optional[List[str]] = None,
+        sample: Optional[np.ndarray] = None
+    ) -> 'ReferenceProfile':
+        # Bin edges come from sample, or else the first matrix, so counting stays a single pass
+        numeric: Dict[str, Dict[str, Any]] = {}
+        categorical: Dict[str, Dict[str, Any]] = {}
+        n_rows = 0
+        for matrix in matrices:
+            if not numeric and not categorical:
+                edge_source = matrix if sample is None else sample
+                for i, name in enumerate(feature_names):
+                    if name in categorical_features:
+                        levels = list(categories[name])
+                        categorical[name] = {'levels': levels, 'counts': np.zeros(len(levels), dtype=np.int64), 'missing': 0}
+                    else:
+                        column = np.asarray(edge_source[:, i], dtype=np.float64)
+                        finite = column[~np.isnan(column)]
+                        edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)[1:-1])) if len(finite) else np.empty(0)
+                        numeric[name] = {'edges': edges, 'counts': np.zeros(len(edges) + 1, dtype=np.int64), 'missing': 0}
+            for i, name in enumerate(feature_names):
+                column = np.asarray(matrix[:, i], dtype=np.float64)
+                missing = int(np.isnan(column).sum())
+                if name in categorical:
+                    codes = column[~np.isnan(column)].astype(np.int64)
+                    categorical[name]['counts'] += np.bincount(codes, minlength=len(categorical[name]['levels']))
+                    categorical[name]['missing'] += missing
+                else:
+                    numeric[name]['counts'] += _bin_numeric(column, numeric[name]['edges'])
+                    numeric[name]['missing'] += missing
+            n_rows += len(matrix)
+        return cls(numeric, categorical, n_rows, date_range)
+    
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        feature_engineer: FeatureEngineer,
+        n_bins: int = 10
+    ) -> 'ReferenceProfile':
+        categories = feature_engineer.get_categories(data)
+        dates = pd.to_datetime(data['date']) if 'date' in data.columns else None
+        date_range = [dates.min().date().isoformat(), dates.max().date().isoformat()] if dates is not None else None
+        return cls.from_matrices(
+            [feature_engineer.to_matrix(data, categories)],
+            feature_engineer.get_feature_columns(),
+            feature_engineer.categorical_features,
+            categories,
+            n_bins,
+            date_range
+        )
+    
+    @classmethod
+    def from_shards(cls, shard_dir: str, n_bins: int = 10) -> 'ReferenceProfile':
+        shard_dir = Path(shard_dir)
+        with open(shard_dir / 'meta.json', 'r') as f:
+            meta = json.load(f)
+        shards = meta['shards']
+        
+        # Evenly spaced rows from every shard, so the edges reflect the whole history
+        per_shard = -(-EDGE_SAMPLE_ROWS // max(len(shards), 1))
+        sample = []
+        for shard in shards:
+            matrix = np.load(shard_dir / shard['features'], mmap_mode='r')
+            rows = np.unique(np.linspace(0, len(matrix) - 1, min(per_shard, len(matrix))).astype(np.int64))
+            sample.append(np.asarray(matrix[rows]))
+        
+        date_range = None
+        if shards and all('date_min' in shard for shard in shards):
+            date_range = [min(shard['date_min'] for shard in shards), max(shard['date_max'] for shard in shards)]
+        
+        matrices = (np.load(shard_dir / shard['features'], mmap_mode='r') for shard in shards)
+        return cls.from_matrices(
+            matrices,
+            meta['feature_names'],
+            meta['categorical_features'],
+            meta['categories'],
+            n_bins,
+            date_range,
+            np.concatenate(sample) if sample else None
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_rows': self.n_rows,
+            'date_range': self.date_range,
+            'numeric': {
+                name: {'edges': s['edges'].tolist(), 'counts': s['counts'].tolist(), 'missing': s['missing']}
+                for name, s in self.numeric.items()
+            },
+            'categorical': {
+                name: {'levels': s['levels'], 'counts': s['counts'].tolist(), 'missing': s['missing']}
+                for name, s in self.categorical.items()
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'ReferenceProfile':
+        numeric = {
+            name: {'edges': np.asarray(s['edges'], dtype=np.float64), 'counts': np.asarray(s['counts'], dtype=np.int64), 'missing': s['missing']}
+            for name, s in state['numeric'].items()
+        }
+        categorical = {
+            name: {'levels': s['levels'], 'counts': np.asarray(s['counts'], dtype=np.int64), 'missing': s['missing']}
+            for name, s in state['categorical'].items()
+        }
+        return cls(numeric, categorical, state['n_rows'], state.get('date_range'))
+
+class DriftMonitor:
+    def __init__(self, profile: ReferenceProfile, config: Optional[MonitoringConfig] = None):
+        self.profile = profile
+        self.config = config or MonitoringConfig()
+        ignored = set(self.config.ignore_features)
+        self.numeric = {name: s for name, s in profile.numeric.items() if name not in ignored}
+        self.categorical = {name: s for name, s in profile.categorical.items() if name not in ignored}
+        self.logger = setup_logger('drift_monitor')
+        self.reset()
+    
+    def reset(self) -> None:
+        self.n_rows = 0
+        self.counts = {name: np.zeros_like(s['counts']) for name, s in {**self.numeric, **self.categorical}.items()}
+        self.missing = {name: 0 for name in self.counts}
+        self.unseen = {name: 0 for name in self.categorical}
+        self.date_min: Optional[pd.Timestamp] = None
+        self.date_max: Optional[pd.Timestamp] = None
+    
+    def update(self, batch: pd.DataFrame) -> None:
+        # One vectorized pass per column; only counts are kept between batches
+        for name, reference in self.numeric.items():
+            if name not in batch.columns:
+                continue
+            values = batch[name].to_numpy(dtype=np.float64)
+            self.counts[name] += _bin_numeric(values, reference['edges'])
+            self.missing[name] += int(np.isnan(values).sum())
+        for name, reference in self.categorical.items():
+            if name not in batch.columns:
+                continue
+            values = batch[name]
+            levels = pd.Index(reference['levels'])
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Map the few batch categories instead of every row
+                lookup = np.append(levels.get_indexer(values.cat.categories.astype(object)), -1)
+                codes = lookup[values.cat.codes.to_numpy()]
+            else:
+                codes = levels.get_indexer(values.astype(object))
+            missing = values.isna().to_numpy()
+            self.counts[name] += np.bincount(codes[codes >= 0], minlength=len(reference['levels']))
+            self.missing[name] += int(missing.sum())
+            self.unseen[name] += int(((codes < 0) & ~missing).sum())
+        if 'date' in batch.columns and len(batch):
+            dates = pd.to_datetime(batch['date'])
+            self.date_min = min(dates.min(), self.date_min) if self.date_min is not None else dates.min()
+            self.date_max = max(dates.max(), self.date_max) if self.date_max is not None else dates.max()
+        self.n_rows += len(batch)
+    
+    def _alert(self, alerts: List[Dict[str, Any]], feature: str, statistic: str, value: float, threshold: float) -> None:
+        if value > threshold:
+            alerts.append({'feature': feature, 'statistic': statistic, 'value': value, 'threshold': threshold})
+    
+    def report(self) -> Dict[str, Any]:
+        config = self.config
+        features: Dict[str, Dict[str, Any]] = {}
+        alerts: List[Dict[str, Any]] = []
+        n_reference = max(self.profile.n_rows, 1)
+        n_batch = max(self.n_rows, 1)
+        for name, reference in {**self.numeric, **self.categorical}.items():
+            stats = {
+                'psi': psi(reference['counts'], self.counts[name]),
+                'missing_rate': self.missing[name] / n_batch,
+                'reference_missing_rate': reference['missing'] / n_reference
+            }
+            if name in self.numeric:
+                stats['ks'] = binned_ks(reference['counts'], self.counts[name])
+                self._alert(alerts, name, 'ks', stats['ks'], config.ks_threshold)
+            else:
+                stats['unseen_rate'] = self.unseen[name] / n_batch
+                self._alert(alerts, name, 'unseen_rate', stats['unseen_rate'], config.unseen_threshold)
+            self._alert(alerts, name, 'psi', stats['psi'], config.psi_threshold)
+            self._alert(
+                alerts, name, 'missing_rate_increase',
+                stats['missing_rate'] - stats['reference_missing_rate'], config.missing_threshold
+            )
+            features[name] = stats
+        
+        dates = {'reference': self.profile.date_range, 'batch': None}
+        if self.date_min is not None:
+            dates['batch'] = [self.date_min.date().isoformat(), self.date_max.date().isoformat()]
+            if self.profile.date_range is not None:
+                start, end = (pd.Timestamp(d) for d in self.profile.date_range)
+                dates['days_before_reference'] = max((start - self.date_min).days, 0)
+                dates['days_after_reference'] = max((self.date_max - end).days, 0)
+                self._alert(alerts, 'date', 'days_before_reference', dates['days_before_reference'], 0)
+                self._alert(alerts, 'date', 'days_after_reference', dates['days_after_reference'], config.max_horizon_days)
+        
+        for alert in alerts:
+            self.logger.warning(
+                f"Drift alert: {alert['feature']} {alert['statistic']}={alert['value']:.4f} "
+                f"exceeds {alert['threshold']}"
+            )
+        return {'rows': self.n_rows, 'features': features, 'dates': dates, 'alerts': alerts}
+
+def reference_path(model_path: str) -> Path:
+    return Path(f"{model_path}.reference.json")
+
+def save_reference_profile(profile: ReferenceProfile, model_path: str) -> None:
+    with open(reference_path(model_path), 'w') as f:
+        json.dump(profile.to_dict(), f)
+
+def load_reference_profile(model_path: str) -> Optional[ReferenceProfile]:
+    path = reference_path(model_path)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return ReferenceProfile.from_dict(json.load(f))
@@ -0,0 +1,430 @@
+import copy
+import hashlib
+import json
+import os
+import yaml
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from .logger import setup_logger
+
+ENV_PREFIX = 'STICKER_'
+
+# Parsed configs keyed by (path, mtime, size, overrides) so repeated loads of an
+# unchanged file skip YAML parsing and validation
+_CONFIG_CACHE: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+class ConfigError(ValueError):
+    pass
+
+def _require(section: Dict[str, Any], key: str, section_name: str) -> Any:
+    if key not in section:
+        raise ConfigError(f"Missing required config key: {section_name}.{key}")
+    return section[key]
+
+def _build(cls, section: Dict[str, Any], section_name: str):
+    try:
+        return cls(**section)
+    except TypeError as e:
+        # Unknown keys surface as unexpected keyword arguments
+        raise ConfigError(f"Invalid {section_name} configuration: {str(e)}")
+
+def _check(condition: bool, message: str) -> None:
+    if not condition:
+        raise ConfigError(message)
+
+@dataclass(frozen=True)
+class DataConfig:
+    target_column: str
+    train_path: Optional[str] = None
+    test_path: Optional[str] = None
+    features: Tuple[str, ...] = ()
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'DataConfig':
+        _require(section, 'target_column', 'data')
+        section = dict(section)
+        section['features'] = tuple(section.get('features') or ())
+        return _build(cls, section, 'data')
+
+@dataclass(frozen=True)
+class FeaturesConfig:
+    time_features: Tuple[str, ...]
+    categorical_features: Tuple[str, ...]
+    
+    @property
+    def feature_columns(self) -> List[str]:
+        return list(self.time_features + self.categorical_features)
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'FeaturesConfig':
+        section = dict(section)
+        section['time_features'] = tuple(_require(section, 'time_features', 'features'))
+        section['categorical_features'] = tuple(_require(section, 'categorical_features', 'features'))
+        return _build(cls, section, 'features')
+
+@dataclass(frozen=True)
+class ModelConfig:
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    model_path: Optional[str] = None
+    # Accepted for older configs; training writes to training.output_dir
+    save_path: Optional[str] = None
+    target_transform: Dict[str, Any] = field(default_factory=lambda: {'name': 'none'})
+    quantiles: Tuple[float, ...] = (0.1, 0.5, 0.9)
+    
+    @property
+    def n_estimators(self) -> int:
+        return self.params.get('n_estimators', 100)
+    
+    @property
+    def early_stopping_rounds(self) -> Optional[int]:
+        return self.params.get('early_stopping_rounds')
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'ModelConfig':
+        params = dict(section.get('params') or {})
+        _check(params.get('n_estimators', 1) > 0, "model.params.n_estimators must be positive")
+        target_transform = section.get('target_transform') or {'name': 'none'}
+        if isinstance(target_transform, str):
+            target_transform = {'name': target_transform}
+        _check(
+            target_transform.get('name') in ('none', 'log1p', 'series_mean', 'ratio_to_total'),
+            f"Unknown target transform: {target_transform.get('name')}"
+        )
+        quantiles = tuple(sorted(float(q) for q in section.get('quantiles') or (0.1, 0.5, 0.9)))
+        _check(all(0 < q < 1 for q in quantiles), "model.quantiles must lie strictly between 0 and 1")
+        _check(len(set(quantiles)) == len(quantiles), "model.quantiles must be distinct")
+        section = dict(section)
+        section.update(
+            name=str(_require(section, 'name', 'model')).lower(),
+            params=params,
+            target_transform=dict(target_transform),
+            quantiles=quantiles
+        )
+        return _build(cls, section, 'model')
+
+@dataclass(frozen=True)
+class OutOfCoreConfig:
+    enabled: bool = False
+    shard_dir: str = 'data/shards'
+    chunk_size: int = 500000
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'OutOfCoreConfig':
+        config = _build(cls, section, 'training.out_of_core')
+        _check(config.chunk_size > 0, "training.out_of_core.chunk_size must be positive")
+        return config
+
+@dataclass(frozen=True)
+class TrainingBudgetConfig:
+    max_wall_time_seconds: Optional[float] = None
+    max_rounds: Optional[int] = None
+    num_threads: Optional[int] = None
+    checkpoint_dir: Optional[str] = None
+    checkpoint_period: int = 50
+    resume: bool = False
+    # Coarse-to-fine stages of {learning_rate, rounds}; the last stage may omit rounds
+    schedule: Tuple[Dict[str, Any], ...] = ()
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'TrainingBudgetConfig':
+        section = dict(section)
+        section['schedule'] = tuple(dict(stage) for stage in section.get('schedule') or ())
+        config = _build(cls, section, 'training.budget')
+        _check(
+            config.max_wall_time_seconds is None or config.max_wall_time_seconds > 0,
+            "training.budget.max_wall_time_seconds must be positive"
+        )
+        _check(config.max_rounds is None or config.max_rounds > 0, "training.budget.max_rounds must be positive")
+        _check(config.num_threads is None or config.num_threads > 0, "training.budget.num_threads must be positive")
+        _check(config.checkpoint_period > 0, "training.budget.checkpoint_period must be positive")
+        _check(not config.resume or config.checkpoint_dir, "training.budget.resume requires checkpoint_dir")
+        for stage in config.schedule:
+            _check(
+                set(stage) <= {'learning_rate', 'rounds'},
+                f"Invalid training.budget.schedule stage: {stage}"
+            )
+            _check(stage.get('learning_rate', 0) > 0, "training.budget.schedule learning_rate must be positive")
+            _check(stage.get('rounds') is None or stage['rounds'] > 0, "training.budget.schedule rounds must be positive")
+        return config
+
+@dataclass(frozen=True)
+class TrainingConfig:
+    test_size: float = 0.2
+    random_state: int = 42
+    n_folds: int = 5
+    output_dir: str = 'models'
+    out_of_core: OutOfCoreConfig = OutOfCoreConfig()
+    budget: TrainingBudgetConfig = TrainingBudgetConfig()
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'TrainingConfig':
+        section = dict(section)
+        out_of_core = OutOfCoreConfig.from_dict(section.pop('out_of_core', None) or {})
+        section['out_of_core'] = out_of_core
+        section['budget'] = TrainingBudgetConfig.from_dict(section.pop('budget', None) or {})
+        config = _build(cls, section, 'training')
+        _check(0 < config.test_size < 1, "training.test_size must be between 0 and 1")
+        # Continuing from init_model needs the raw rows, which streamed shards do not keep
+        _check(
+            not (config.budget.resume and config.out_of_core.enabled),
+            "training.budget.resume is not supported with training.out_of_core.enabled"
+        )
+        return config
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    n_origins: int = 4
+    horizon_days: int = 90
+    step_days: Optional[int] = None
+    n_jobs: int = 2
+    threads_per_worker: int = 1
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'BacktestConfig':
+        config = _build(cls, section, 'backtest')
+        _check(config.n_origins > 0, "backtest.n_origins must be positive")
+        _check(config.horizon_days > 0, "backtest.horizon_days must be positive")
+        _check(config.n_jobs > 0, "backtest.n_jobs must be positive")
+        return config
+
+@dataclass(frozen=True)
+class PredictionCacheConfig:
+    enabled: bool = False
+    max_entries: int = 1000000
+    cache_dir: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'PredictionCacheConfig':
+        config = _build(cls, section, 'prediction.cache')
+        _check(config.max_entries > 0, "prediction.cache.max_entries must be positive")
+        return config
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    chunk_size: int = 100000
+    queue_size: int = 2
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'PipelineConfig':
+        config = _build(cls, section, 'prediction.pipeline')
+        _check(config.chunk_size > 0, "prediction.pipeline.chunk_size must be positive")
+        _check(config.queue_size > 0, "prediction.pipeline.queue_size must be positive")
+        return config
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    mode: str = 'single'
+    n_workers: int = 4
+    threads_per_worker: int = 1
+    shard_rows: int = 1000000
+    output_format: str = 'parquet'
+    output_dir: str = 'models/predictions'
+    merge_csv: bool = True
+    cache: PredictionCacheConfig = PredictionCacheConfig()
+    pipeline: PipelineConfig = PipelineConfig()
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'PredictionConfig':
+        section = dict(section)
+        section['cache'] = PredictionCacheConfig.from_dict(section.pop('cache', None) or {})
+        section['pipeline'] = PipelineConfig.from_dict(section.pop('pipeline', None) or {})
+        config = _build(cls, section, 'prediction')
+        _check(config.mode in ('single', 'sharded', 'pipeline'), f"Unknown prediction mode: {config.mode}")
+        _check(config.output_format in ('parquet', 'feather'), f"Unknown output format: {config.output_format}")
+        _check(config.n_workers > 0, "prediction.n_workers must be positive")
+        _check(config.shard_rows > 0, "prediction.shard_rows must be positive")
+        return config
+
+@dataclass(frozen=True)
+class ReconciliationConfig:
+    enabled: bool = False
+    method: str = 'bottom_up'
+    weights: str = 'wls_struct'
+    history_path: Optional[str] = None
+    aggregate_forecasts_path: Optional[str] = None
+    output_path: str = 'models/reconciled_predictions.csv'
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'ReconciliationConfig':
+        config = _build(cls, section, 'reconciliation')
+        _check(config.method in ('bottom_up', 'top_down', 'mint'), f"Unknown reconciliation method: {config.method}")
+        _check(config.weights in ('ols', 'wls_struct', 'wls_var'), f"Unknown reconciliation weights: {config.weights}")
+        needs_history = config.method == 'top_down' or (config.method == 'mint' and config.weights == 'wls_var')
+        _check(
+            not (config.enabled and needs_history and config.history_path is None),
+            f"reconciliation.history_path is required for {config.method} with {config.weights} weights"
+        )
+        # Without aggregate base forecasts MinT has nothing to trade off and returns the bottom-up sums
+        _check(
+            not (config.enabled and config.method == 'mint' and config.aggregate_forecasts_path is None),
+            "reconciliation.aggregate_forecasts_path is required for mint"
+        )
+        return config
+
+@dataclass(frozen=True)
+class ExplainConfig:
+    chunk_size: int = 100000
+    group_columns: Tuple[str, ...] = ('country', 'store', 'product')
+    write_rows: bool = True
+    output_dir: str = 'models/explanations'
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'ExplainConfig':
+        section = dict(section)
+        if 'group_columns' in section:
+            section['group_columns'] = tuple(section['group_columns'] or ())
+        config = _build(cls, section, 'explain')
+        _check(config.chunk_size > 0, "explain.chunk_size must be positive")
+        return config
+
+@dataclass(frozen=True)
+class MonitoringConfig:
+    # Calendar features are fixed by the dates being scored, so any batch shorter
+    # than the training history shifts them; the date range check covers them instead
+    enabled: bool = False
+    n_bins: int = 10
+    psi_threshold: float = 0.2
+    ks_threshold: float = 0.1
+    unseen_threshold: float = 0.01
+    missing_threshold: float = 0.05
+    max_horizon_days: int = 366
+    ignore_features: Tuple[str, ...] = ('year', 'month', 'quarter', 'day', 'dayofweek', 'is_weekend', 'is_holiday')
+    report_path: str = 'models/run_report.json'
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'MonitoringConfig':
+        section = dict(section)
+        if 'ignore_features' in section:
+            section['ignore_features'] = tuple(section['ignore_features'] or ())
+        config = _build(cls, section, 'monitoring')
+        _check(config.n_bins > 1, "monitoring.n_bins must be greater than 1")
+        return config
+
+@dataclass(frozen=True)
+class RegistryConfig:
+    enabled: bool = False
+    root: str = 'models/registry'
+    promote: bool = True
+    poll_seconds: float = 5.0
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'RegistryConfig':
+        config = _build(cls, section, 'registry')
+        _check(config.poll_seconds >= 0, "registry.poll_seconds must not be negative")
+        return config
+
+@dataclass(frozen=True)
+class OutputConfig:
+    predictions_path: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, section: Dict[str, Any]) -> 'OutputConfig':
+        return _build(cls, section, 'output')
+
+@dataclass(frozen=True)
+class Config:
+    data: DataConfig
+    features: FeaturesConfig
+    model: ModelConfig
+    training: TrainingConfig
+    backtest: BacktestConfig
+    prediction: PredictionConfig
+    reconciliation: ReconciliationConfig
+    explain: ExplainConfig
+    monitoring: MonitoringConfig
+    registry: RegistryConfig
+    output: OutputConfig
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+    hash: str = ''
+    
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'Config':
+        typed_config = cls(
+            data=DataConfig.from_dict(_require(config, 'data', 'config')),
+            features=FeaturesConfig.from_dict(_require(config, 'features', 'config')),
+            model=ModelConfig.from_dict(_require(config, 'model', 'config')),
+            training=TrainingConfig.from_dict(config.get('training') or {}),
+            backtest=BacktestConfig.from_dict(config.get('backtest') or {}),
+            prediction=PredictionConfig.from_dict(config.get('prediction') or {}),
+            reconciliation=ReconciliationConfig.from_dict(config.get('reconciliation') or {}),
+            explain=ExplainConfig.from_dict(config.get('explain') or {}),
+            monitoring=MonitoringConfig.from_dict(config.get('monitoring') or {}),
+            registry=RegistryConfig.from_dict(config.get('registry') or {}),
+            output=OutputConfig.from_dict(config.get('output') or {}),
+            raw=config,
+            hash=config_hash(config)
+        )
+        # Reconciliation needs every series of a date at once, which streamed chunks do not provide
+        _check(
+            not (typed_config.reconciliation.enabled and typed_config.prediction.mode == 'pipeline'),
+            "reconciliation is not supported in pipeline prediction mode"
+        )
+        return typed_config
+
+def config_hash(config: Dict[str, Any]) -> str:
+    canonical = json.dumps(config, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+def _set_path(config: Dict[str, Any], path: Sequence[str], value: Any) -> None:
+    node = config
+    for key in path[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            child = node[key] = {}
+        node = child
+    node[path[-1]] = value
+
+def parse_overrides(overrides: Sequence[str]) -> List[Tuple[List[str], Any]]:
+    parsed = []
+    for override in overrides:
+        if '=' not in override:
+            raise ConfigError(f"Override must look like key.path=value: {override}")
+        key, value = override.split('=', 1)
+        parsed.append((key.strip().split('.'), yaml.safe_load(value)))
+    return parsed
+
+def env_overrides(environ: Optional[Dict[str, str]] = None) -> List[str]:
+    # STICKER_MODEL__PARAMS__LEARNING_RATE=0.05 -> model.params.learning_rate=0.05
+    environ = os.environ if environ is None else environ
+    return sorted(
+        f"{name[len(ENV_PREFIX):].lower().replace('__', '.')}={value}"
+        for name, value in environ.items()
+        if name.startswith(ENV_PREFIX)
+    )
+
+def load_config(config_path: str, overrides: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    logger = setup_logger('config_loader')
+    logger.info(f"Loading configuration from {config_path}")
+    try:
+        path = Path(config_path).resolve()
+        stat = path.stat()
+        all_overrides = tuple(env_overrides()) + tuple(overrides or ())
+        key = (str(path), stat.st_mtime_ns, stat.st_size, all_overrides)
+        if key not in _CONFIG_CACHE:
+            with open(path, 'r') as f:
+                config = yaml.safe_load(f)
+            if not isinstance(config, dict):
+                raise ConfigError("Configuration must be a dictionary")
+            for keys, value in parse_overrides(all_overrides):
+                _set_path(config, keys, value)
+            Config.from_dict(config)
+            _CONFIG_CACHE[key] = config
+        logger.info("Configuration loaded successfully")
+        return copy.deepcopy(_CONFIG_CACHE[key])
+    except ConfigError as e:
+        logger.error(f"Invalid configuration: {str(e)}")
+        raise
+    except yaml.YAMLError as e:
+        logger.error(f"Error parsing YAML configuration: {str(e)}")
+        raise ConfigError(f"Invalid YAML configuration: {str(e)}")
+    except FileNotFoundError:
+        logger.error(f"Configuration file not found: {config_path}")
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    except Exception as e:
+        logger.error(f"Error loading configuration: {str(e)}")
+        raise RuntimeError(f"Failed to load configuration: {str(e)}")
+
+def load_typed_config(config_path: str, overrides: Optional[Sequence[str]] = None) -> Config:
+    return Config.from_dict(load_config(config_path, overrides))
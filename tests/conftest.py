@@ -1,8 +1,11 @@
+import copy
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional, Tuple
+from src.features.feature_engineer import FeatureEngineer
+from src.models.model_factory import ModelFactory
 
 @pytest.fixture
 def sample_config() -> Dict[str, Any]:
@@ -61,4 +64,22 @@ def sample_data() -> pd.DataFrame:
                         'num_sold': np.random.randint(0, 100)
                     })
     
-    return pd.DataFrame(data) 
\ No newline at end of file
+    return pd.DataFrame(data) 
+
+@pytest.fixture
+def trained_model(sample_config, sample_data) -> Callable[..., Tuple[Any, Dict[str, Any], pd.DataFrame]]:
+    # Call with dotted overrides, e.g. trained_model({'model.params.n_estimators': 10});
+    # trains on rows [0, 6000), validates on [6000, 8000) and leaves the rest for scoring
+    def train(overrides: Optional[Dict[str, Any]] = None):
+        config = copy.deepcopy(sample_config)
+        for key, value in (overrides or {}).items():
+            *parents, leaf = key.split('.')
+            node = config
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+        features = FeatureEngineer(config).create_features(sample_data)
+        model = ModelFactory.create_model(config)
+        model.train(features.iloc[:6000], features.iloc[6000:8000])
+        return model, config, features
+    return train
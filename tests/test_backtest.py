@@ -0,0 +1,42 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.features.feature_engineer import FeatureEngineer
+from src.models.backtest import Backtester
+
+@pytest.fixture
+def backtest_config(sample_config):
+    sample_config['backtest'] = {
+        'n_origins': 3,
+        'horizon_days': 30,
+        'step_days': 30,
+        'n_jobs': 2,
+        'threads_per_worker': 1
+    }
+    return sample_config
+
+def test_make_origins(backtest_config, sample_data):
+    backtester = Backtester(backtest_config)
+    origins = backtester.make_origins(sample_data['date'])
+    
+    assert len(origins) == 3
+    assert np.diff(origins).tolist() == [30, 30]
+    last_day = sample_data['date'].values.astype('datetime64[D]').astype(np.int64).max()
+    assert origins[-1] + 30 - 1 == last_day
+
+def test_run_backtest(backtest_config, sample_data):
+    data = FeatureEngineer(backtest_config).create_features(sample_data)
+    table = Backtester(backtest_config).run(data)
+    
+    assert len(table) == 3
+    assert list(table['origin']) == sorted(table['origin'])
+    assert (table['test_rows'] == 30 * 27).all()
+    assert table['train_rows'].is_monotonic_increasing
+    for column in ['mape', 'smape', 'mae', 'rmse', 'bias']:
+        assert table[column].notna().all()
+
+def test_parse_args():
+    from src.models.backtest import parse_args
+    args = parse_args(['--config', 'configs/custom.yaml', 'backtest.n_origins=2'])
+    assert args.config == 'configs/custom.yaml'
+    assert args.overrides == ['backtest.n_origins=2']
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import lightgbm as lgb
+from src.features.feature_engineer import FeatureEngineer
+from src.models.callbacks import TrainingController, load_checkpoint
+from src.models.lightgbm_model import LightGBMModel
+from src.utils.config import ConfigError, TrainingConfig
+
+def _budget(**budget):
+    return {'model.params.early_stopping_rounds': None, 'training.budget': budget}
+
+def test_max_rounds_caps_training(trained_model):
+    model, _, _ = trained_model(_budget(max_rounds=7, num_threads=1))
+    
+    assert model.model.current_iteration() == 7
+    assert 1 <= model.model.best_iteration <= 7
+
+def test_wall_time_budget_stops_early(trained_model):
+    model, _, _ = trained_model(_budget(max_wall_time_seconds=1e-6))
+    
+    assert model.model.current_iteration() == 1
+    assert model.model.best_iteration == 1
+
+def test_schedule_moves_to_refinement_stage(trained_model):
+    model, _, _ = trained_model(_budget(
+        max_rounds=30,
+        schedule=[{'learning_rate': 0.3, 'rounds': 10}, {'learning_rate': 0.02}]
+    ))
+    
+    assert model.model.current_iteration() <= 30
+    assert model.model.best_iteration <= model.model.current_iteration()
+
+def test_checkpoint_resume(sample_config, sample_data, trained_model, tmp_path):
+    df = FeatureEngineer(sample_config).create_features(sample_data)
+    X = df[LightGBMModel(sample_config).feature_cols]
+    booster = lgb.train(
+        {'objective': 'regression', 'verbose': -1},
+        lgb.Dataset(X.iloc[:6000], label=df['num_sold'].iloc[:6000]),
+        num_boost_round=8
+    )
+    controller = TrainingController(
+        [{'learning_rate': 0.05}],
+        checkpoint_dir=str(tmp_path),
+        state={'best_trees': 0}
+    )
+    controller.best_trees = 8
+    controller.save_checkpoint(booster)
+    assert load_checkpoint(str(tmp_path))[1]['best_trees'] == 8
+    
+    model, _, _ = trained_model(_budget(max_rounds=20, checkpoint_dir=str(tmp_path), resume=True))
+    
+    # Resumed runs continue from the checkpoint and stop at the same total budget
+    assert model.model.current_iteration() == 20
+    assert load_checkpoint(str(tmp_path)) == (None, None)
+
+def test_invalid_budget():
+    with pytest.raises(ConfigError):
+        TrainingConfig.from_dict({'budget': {'resume': True}})
+    with pytest.raises(ConfigError):
+        TrainingConfig.from_dict({'budget': {'schedule': [{'learning_rate': 0}]}})
+    with pytest.raises(ConfigError):
+        TrainingConfig.from_dict({
+            'out_of_core': {'enabled': True},
+            'budget': {'checkpoint_dir': 'checkpoints', 'resume': True}
+        })
@@ -1,3 +1,4 @@
+import copy
 import pytest
 import yaml
 import os
@@ -32,4 +33,71 @@ def test_load_predict_config(tmp_path: str, sample_config: Dict[str, Any]) -> No
 def test_config_file_not_found() -> None:
     from src.models.train import load_config
     with pytest.raises(FileNotFoundError):
-        load_config('nonexistent_config.yaml') 
\ No newline at end of file
+        load_config('nonexistent_config.yaml')
+
+def test_load_config_overrides(tmp_path: str, sample_config: Dict[str, Any], monkeypatch) -> None:
+    config_path = os.path.join(tmp_path, 'train_config.yaml')
+    with open(config_path, 'w') as f:
+        yaml.dump(sample_config, f)
+    
+    from src.utils.config import load_config
+    monkeypatch.setenv('STICKER_TRAINING__TEST_SIZE', '0.3')
+    loaded_config = load_config(config_path, ['model.params.learning_rate=0.1', 'output.predictions_path=out.csv'])
+    
+    assert loaded_config['model']['params']['learning_rate'] == 0.1
+    assert loaded_config['output']['predictions_path'] == 'out.csv'
+    assert loaded_config['training']['test_size'] == 0.3
+
+def test_load_config_returns_independent_copies(tmp_path: str, sample_config: Dict[str, Any]) -> None:
+    config_path = os.path.join(tmp_path, 'train_config.yaml')
+    with open(config_path, 'w') as f:
+        yaml.dump(sample_config, f)
+    
+    from src.utils.config import load_config
+    first = load_config(config_path)
+    first['model']['name'] = 'changed'
+    assert load_config(config_path)['model']['name'] == 'lightgbm'
+
+def test_invalid_config(tmp_path: str, sample_config: Dict[str, Any]) -> None:
+    from src.utils.config import ConfigError, load_config
+    sample_config['training']['test_size'] = 1.5
+    config_path = os.path.join(tmp_path, 'train_config.yaml')
+    with open(config_path, 'w') as f:
+        yaml.dump(sample_config, f)
+    
+    with pytest.raises(ConfigError):
+        load_config(config_path)
+    
+    del sample_config['features']
+    with pytest.raises(ConfigError):
+        from src.utils.config import Config
+        Config.from_dict(sample_config)
+
+def test_typed_config_and_hash(sample_config: Dict[str, Any]) -> None:
+    from src.utils.config import Config
+    config = Config.from_dict(sample_config)
+    
+    assert config.data.target_column == 'num_sold'
+    assert config.features.feature_columns[-3:] == ['country', 'store', 'product']
+    assert config.model.n_estimators == 100
+    assert config.prediction.mode == 'single'
+    assert config.hash == Config.from_dict(dict(reversed(list(sample_config.items())))).hash
+    
+    sample_config['model']['params']['learning_rate'] = 0.1
+    assert Config.from_dict(sample_config).hash != config.hash
+
+def test_unknown_keys_rejected(sample_config: Dict[str, Any]) -> None:
+    from src.utils.config import Config, ConfigError
+    typo_data = copy.deepcopy(sample_config)
+    typo_data['data']['trian_path'] = 'data/train.csv'
+    with pytest.raises(ConfigError):
+        Config.from_dict(typo_data)
+    
+    typo_model = copy.deepcopy(sample_config)
+    typo_model['model']['model_pth'] = 'models/model.pkl'
+    with pytest.raises(ConfigError):
+        Config.from_dict(typo_model)
+    
+    from src.models.registry import resolve_model_path
+    with pytest.raises(ConfigError):
+        resolve_model_path(Config.from_dict(sample_config))
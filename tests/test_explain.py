@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.models.explain import ModelExplainer
+
+@pytest.fixture
+def trained(trained_model):
+    model, config, df = trained_model({'model.params.n_estimators': 20})
+    return config, model, df.iloc[8000:]
+
+def test_feature_importance(trained):
+    _, model, _ = trained
+    importance = model.feature_importance()
+    
+    assert set(importance['feature']) == set(model.feature_cols)
+    assert importance['gain'].is_monotonic_decreasing
+    assert importance['gain_share'].sum() == pytest.approx(1.0)
+
+def test_contributions_sum_to_raw_prediction(trained):
+    _, model, test_df = trained
+    contributions = model.predict_contributions(test_df)
+    
+    assert list(contributions.columns) == [f"contrib_{c}" for c in model.feature_cols] + ['bias']
+    np.testing.assert_allclose(contributions.sum(axis=1), model.model.predict(test_df[model.feature_cols]))
+
+def test_explainer_chunks_match_single_pass(trained, tmp_path):
+    config, model, test_df = trained
+    config['explain'] = {'chunk_size': 97, 'output_dir': str(tmp_path)}
+    paths = ModelExplainer(config, model).run(test_df)
+    
+    rows = pd.read_parquet(paths['contributions'])
+    assert len(rows) == len(test_df)
+    np.testing.assert_allclose(
+        rows.filter(like='contrib_').to_numpy(),
+        model.predict_contributions(test_df).filter(like='contrib_').to_numpy()
+    )
+    
+    by_store = pd.read_parquet(paths['by_store'])
+    expected = rows.groupby('store')['contrib_year'].mean()
+    assert by_store['rows'].sum() == len(test_df)
+    np.testing.assert_allclose(by_store.set_index('store')['mean_contrib_year'], expected.loc[by_store['store']])
+    assert (by_store.filter(like='mean_abs_') >= 0).all().all()
@@ -0,0 +1,46 @@
+import pytest
+import pandas as pd
+import numpy as np
+from sklearn.metrics import mean_absolute_percentage_error, mean_absolute_error, mean_squared_error
+from src.models.metrics import compute_metrics, compute_breakdowns, evaluation_report
+
+@pytest.fixture
+def scored_data(sample_data):
+    rng = np.random.default_rng(0)
+    data = sample_data.copy()
+    data['num_sold'] = data['num_sold'] + 1
+    predictions = data['num_sold'].to_numpy() * rng.uniform(0.8, 1.2, len(data))
+    return data, predictions
+
+def test_compute_metrics_matches_sklearn(scored_data):
+    data, predictions = scored_data
+    metrics = compute_metrics(data['num_sold'].to_numpy(), predictions)
+    
+    assert set(metrics) == {'mape', 'smape', 'mae', 'rmse', 'bias'}
+    assert metrics['mape'] == pytest.approx(
+        mean_absolute_percentage_error(data['num_sold'], predictions) * 100
+    )
+    assert metrics['mae'] == pytest.approx(mean_absolute_error(data['num_sold'], predictions))
+    assert metrics['rmse'] == pytest.approx(np.sqrt(mean_squared_error(data['num_sold'], predictions)))
+    assert metrics['bias'] == pytest.approx(np.mean(predictions - data['num_sold']))
+
+def test_compute_breakdowns(scored_data):
+    data, predictions = scored_data
+    breakdowns = compute_breakdowns(data, predictions, 'num_sold')
+    
+    assert set(breakdowns) == {'country', 'store', 'product', 'month'}
+    assert len(breakdowns['month']) == 12
+    assert breakdowns['country']['count'].sum() == len(data)
+    
+    us = (data['country'] == 'US').to_numpy()
+    expected = compute_metrics(data.loc[us, 'num_sold'].to_numpy(), predictions[us])
+    row = breakdowns['country'].set_index('country').loc['US']
+    assert row['mape'] == pytest.approx(expected['mape'])
+    assert row['rmse'] == pytest.approx(expected['rmse'])
+
+def test_evaluation_report(scored_data):
+    data, predictions = scored_data
+    report = evaluation_report(data, predictions, 'num_sold', group_columns=['store'])
+    
+    assert report['overall'] == compute_metrics(data['num_sold'].to_numpy(), predictions)
+    assert list(report['breakdowns']) == ['store']
@@ -110,4 +110,62 @@ def test_model_factory(model_config):
     
     with pytest.raises(ValueError):
         model_config['model']['name'] = 'unknown_model'
-        ModelFactory.create_model(model_config) 
\ No newline at end of file
+        ModelFactory.create_model(model_config)
+
+def test_train_from_shards(model_config, sample_data, tmp_path):
+    from src.data.data_processor import DataProcessor
+    
+    model_config['training'] = {'test_size': 0.2}
+    model_config['features']['time_features'] = ['year', 'month', 'day', 'dayofweek']
+    csv_path = tmp_path / "train.csv"
+    sample_data.iloc[:2000].to_csv(csv_path, index=False)
+    
+    processor = DataProcessor(model_config)
+    meta = processor.write_feature_shards(str(csv_path), str(tmp_path / "shards"), chunk_size=400)
+    assert len(meta['shards']) == 5
+    assert meta['n_rows'] == 2000
+    
+    model = LightGBMModel(model_config)
+    model.train_from_shards(str(tmp_path / "shards"))
+    assert isinstance(model.model, lgb.Booster)
+    assert {'mape', 'rmse'} <= set(model.validation_metrics)
+    
+    test_data = processor.feature_engineer.create_features(sample_data.iloc[2000:2100])
+    predictions = model.predict(test_data)
+    assert len(predictions) == 100
+    assert not predictions['num_sold'].isnull().any()
+
+def test_evaluate_reuses_predictions(model_config, sample_data):
+    from src.features.feature_engineer import FeatureEngineer
+    
+    data = FeatureEngineer(model_config).create_features(sample_data)
+    data['num_sold'] = data['num_sold'] + 1
+    model = LightGBMModel(model_config)
+    model.train(data.iloc[:2000], data.iloc[2000:2500])
+    
+    val_data = data.iloc[2000:2500]
+    predictions = model.predict(val_data)
+    mape = model.evaluate(val_data, predictions=predictions)
+    assert mape == pytest.approx(model.evaluate(val_data))
+    
+    report = model.evaluate_report(val_data, predictions=predictions)
+    assert report['overall']['mape'] == pytest.approx(mape)
+    assert set(report['breakdowns']) == {'country', 'store', 'product', 'month'}
+
+def test_shard_split_follows_dates(model_config, sample_data, tmp_path):
+    from src.data.data_processor import DataProcessor
+    
+    model_config['training'] = {'test_size': 0.2}
+    model_config['features']['time_features'] = ['year', 'month', 'day', 'dayofweek']
+    csv_path = tmp_path / "train.csv"
+    # Latest dates first, so CSV order and time order disagree
+    sample_data.iloc[:2000].iloc[::-1].to_csv(csv_path, index=False)
+    
+    processor = DataProcessor(model_config)
+    meta = processor.write_feature_shards(str(csv_path), str(tmp_path / "shards"), chunk_size=300)
+    assert all(shard['date_min'] <= shard['date_max'] for shard in meta['shards'])
+    
+    train_shards, val_shards = LightGBMModel(model_config)._split_shards(meta['shards'])
+    assert val_shards[0]['date_min'] >= max(shard['date_max'] for shard in train_shards)
+    assert sum(shard['rows'] for shard in val_shards) in (300, 500)
+    assert meta['shards'][0] in val_shards
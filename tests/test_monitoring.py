@@ -0,0 +1,103 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.features.feature_engineer import FeatureEngineer
+from src.models.lightgbm_model import LightGBMModel
+from src.monitoring import DriftMonitor, ReferenceProfile
+from src.monitoring.drift import binned_ks, psi, reference_path
+from src.utils.config import MonitoringConfig
+
+@pytest.fixture
+def features(sample_config, sample_data):
+    return FeatureEngineer(sample_config).create_features(sample_data)
+
+@pytest.fixture
+def profile(sample_config, features):
+    return ReferenceProfile.from_frame(features, FeatureEngineer(sample_config))
+
+def test_psi_and_ks():
+    counts = np.array([10, 20, 30])
+    
+    assert psi(counts, counts * 2) == pytest.approx(0.0)
+    assert binned_ks(counts, counts) == 0.0
+    assert psi(counts, np.array([30, 20, 10])) > 0.2
+    assert binned_ks(np.array([1, 0]), np.array([0, 1])) == 1.0
+
+def test_reference_profile(profile, features):
+    assert profile.n_rows == len(features)
+    assert profile.date_range == ['2023-01-01', '2023-12-31']
+    assert profile.categorical['store']['levels'] == ['Store1', 'Store2', 'Store3']
+    assert profile.categorical['store']['counts'].sum() == len(features)
+    assert profile.numeric['month']['counts'].sum() == len(features)
+    
+    restored = ReferenceProfile.from_dict(profile.to_dict())
+    np.testing.assert_array_equal(restored.numeric['month']['edges'], profile.numeric['month']['edges'])
+
+def test_no_alerts_on_matching_batch(profile, features):
+    monitor = DriftMonitor(profile, MonitoringConfig(ignore_features=('year',)))
+    monitor.update(features.sample(frac=0.5, random_state=0))
+    report = monitor.report()
+    
+    assert report['alerts'] == []
+    assert report['features']['month']['psi'] < 0.05
+
+def test_shifted_batch_raises_alerts(profile, features):
+    batch = features.copy()
+    batch['month'] = 1
+    batch['store'] = batch['store'].astype(object)
+    batch.loc[batch.index[:500], 'store'] = 'Store9'
+    batch['date'] = pd.to_datetime(batch['date']) + pd.Timedelta(days=800)
+    monitor = DriftMonitor(profile, MonitoringConfig(ignore_features=()))
+    monitor.update(batch)
+    alerts = {(a['feature'], a['statistic']) for a in monitor.report()['alerts']}
+    
+    assert ('month', 'psi') in alerts
+    assert ('month', 'ks') in alerts
+    assert ('store', 'unseen_rate') in alerts
+    assert ('date', 'days_after_reference') in alerts
+
+@pytest.mark.parametrize('days', [90, 1])
+def test_no_alerts_on_short_horizon_batch(sample_config, features, days):
+    # Same series and sales distribution, but only a few days of the calendar
+    dates = pd.to_datetime(features['date'])
+    reference = features[dates < '2023-10-01']
+    profile = ReferenceProfile.from_frame(reference, FeatureEngineer(sample_config))
+    batch = features[(dates >= '2023-10-01') & (dates < pd.Timestamp('2023-10-01') + pd.Timedelta(days=days))]
+    
+    monitor = DriftMonitor(profile, MonitoringConfig())
+    monitor.update(batch)
+    report = monitor.report()
+    assert report['alerts'] == []
+    assert report['dates']['days_after_reference'] == days
+
+def test_streaming_matches_single_pass(profile, features):
+    single = DriftMonitor(profile)
+    single.update(features)
+    streamed = DriftMonitor(profile)
+    for start in range(0, len(features), 1000):
+        streamed.update(features.iloc[start:start + 1000])
+    
+    assert streamed.report() == single.report()
+
+def test_profile_saved_with_model(trained_model, tmp_path):
+    model, config, _ = trained_model({'model.params.n_estimators': 5})
+    path = str(tmp_path / 'model.txt')
+    model.save(path)
+    
+    assert reference_path(path).exists()
+    loaded = LightGBMModel(config)
+    loaded.load(path)
+    assert loaded.reference_profile.n_rows == 6000
+
+def test_profile_from_shards(sample_config, sample_data, tmp_path):
+    from src.data.data_processor import DataProcessor
+    csv_path = tmp_path / 'train.csv'
+    sample_data.to_csv(csv_path, index=False)
+    DataProcessor(sample_config).write_feature_shards(str(csv_path), str(tmp_path / 'shards'), chunk_size=1000)
+    
+    profile = ReferenceProfile.from_shards(str(tmp_path / 'shards'))
+    assert profile.n_rows == len(sample_data)
+    assert profile.date_range == ['2023-01-01', '2023-12-31']
+    # The first shard only covers January; edges sampled across shards span the year
+    assert profile.numeric['month']['edges'].max() >= 11
+    assert profile.numeric['month']['counts'].sum() == len(sample_data)
@@ -0,0 +1,38 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.data_processor import DataProcessor
+from src.models.pipeline import PredictionPipeline
+
+@pytest.fixture
+def pipeline_setup(sample_config, sample_data, trained_model, tmp_path):
+    model, _, data = trained_model()
+    
+    test_path = tmp_path / "test.csv"
+    sample_data.iloc[8000:].drop(columns=['num_sold']).to_csv(test_path, index=False)
+    sample_config['data']['test_path'] = str(test_path)
+    sample_config['prediction'] = {'pipeline': {'chunk_size': 250, 'queue_size': 1}}
+    return model, data.iloc[8000:]
+
+def test_pipeline_matches_single_pass(sample_config, pipeline_setup, tmp_path):
+    model, test_data = pipeline_setup
+    pipeline = PredictionPipeline(sample_config, model, DataProcessor(sample_config))
+    output_path = tmp_path / "predictions.csv"
+    stats = pipeline.run(str(output_path))
+    
+    assert stats['rows'] == len(test_data)
+    assert stats['chunks'] == int(np.ceil(len(test_data) / 250))
+    assert set(stats['stage_seconds']) == {'read', 'featurize', 'score', 'write'}
+    
+    written = pd.read_csv(output_path)
+    expected = model.predict(test_data)
+    np.testing.assert_array_equal(written['id'], expected['id'])
+    np.testing.assert_allclose(written['num_sold'], expected['num_sold'], rtol=1e-6)
+
+def test_pipeline_propagates_stage_errors(sample_config, pipeline_setup, tmp_path):
+    model, _ = pipeline_setup
+    model.model = None
+    pipeline = PredictionPipeline(sample_config, model, DataProcessor(sample_config))
+    
+    with pytest.raises(RuntimeError):
+        pipeline.run(str(tmp_path / "predictions.csv"))
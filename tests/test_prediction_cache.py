@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.prediction_cache import PredictionCache
+
+def test_hash_rows_is_deterministic():
+    matrix = np.array([[1, 2], [3, 4], [1, 2]], dtype=np.float32)
+    keys = PredictionCache.hash_rows(matrix)
+    
+    assert keys.dtype == np.uint64
+    assert keys[0] == keys[2]
+    assert keys[0] != keys[1]
+
+def test_lookup_and_insert():
+    cache = PredictionCache()
+    cache.bind('v1')
+    keys = np.array([5, 1, 3], dtype=np.uint64)
+    cache.insert(keys, np.array([50.0, 10.0, 30.0]))
+    
+    values, hit = cache.lookup(np.array([3, 4, 5], dtype=np.uint64))
+    assert hit.tolist() == [True, False, True]
+    assert values[0] == 30.0 and values[2] == 50.0
+    assert cache.stats['hits'] == 2
+    assert cache.stats['misses'] == 1
+
+def test_lru_eviction():
+    cache = PredictionCache(max_entries=2)
+    cache.bind('v1')
+    cache.insert(np.array([1, 2], dtype=np.uint64), np.array([1.0, 2.0]))
+    cache.lookup(np.array([1], dtype=np.uint64))
+    cache.insert(np.array([3], dtype=np.uint64), np.array([3.0]))
+    
+    assert cache.keys.tolist() == [1, 3]
+
+def test_disk_store_is_scoped_to_version(tmp_path):
+    cache = PredictionCache(cache_dir=str(tmp_path))
+    cache.bind('v1')
+    cache.insert(np.array([1], dtype=np.uint64), np.array([1.0]))
+    cache.save()
+    
+    reloaded = PredictionCache(cache_dir=str(tmp_path))
+    reloaded.bind('v1')
+    assert reloaded.stats['entries'] == 1
+    
+    reloaded.bind('v2')
+    assert reloaded.stats['entries'] == 0
+    assert not (tmp_path / 'v1.npz').exists()
+
+def test_cached_model_predictions(trained_model, tmp_path):
+    model, _, data = trained_model()
+    expected = model.predict(data.iloc[8000:])
+    
+    model.enable_prediction_cache(PredictionCache(cache_dir=str(tmp_path / "cache")))
+    first = model.predict(data.iloc[8000:])
+    second = model.predict(data.iloc[8000:])
+    
+    np.testing.assert_allclose(first['num_sold'], expected['num_sold'])
+    np.testing.assert_allclose(second['num_sold'], expected['num_sold'])
+    assert model.prediction_cache.stats['hits'] == len(data) - 8000
+    
+    version = model.model_version
+    model.train(data.iloc[:5000], data.iloc[5000:8000])
+    model.save(str(tmp_path / "model.txt"))
+    assert model.model_version != version
+    assert model.prediction_cache.stats['entries'] == 0
@@ -0,0 +1,65 @@
+import copy
+import pytest
+import numpy as np
+import pandas as pd
+from src.models.metrics import quantile_report
+from src.models.model_factory import ModelFactory
+from src.models.quantile_model import QuantileLightGBMModel
+
+@pytest.fixture
+def quantile_config(sample_config):
+    config = copy.deepcopy(sample_config)
+    config['model']['name'] = 'lightgbm_quantile'
+    config['model']['quantiles'] = [0.9, 0.1, 0.5]
+    config['model']['params']['n_estimators'] = 30
+    return config
+
+@pytest.fixture
+def trained(quantile_config, trained_model):
+    model, _, df = trained_model({'model': quantile_config['model']})
+    return model, df.iloc[8000:]
+
+def test_factory_creates_quantile_model(quantile_config):
+    model = ModelFactory.create_model(quantile_config)
+    
+    assert isinstance(model, QuantileLightGBMModel)
+    assert model.quantiles == [0.1, 0.5, 0.9]
+    assert model.point_quantile == 0.5
+
+def test_predictions_do_not_cross(trained):
+    model, test_df = trained
+    predictions = model.predict(test_df)
+    
+    assert list(predictions.columns) == ['id', 'num_sold', 'num_sold_p10', 'num_sold_p50', 'num_sold_p90']
+    values = predictions[model.quantile_columns].to_numpy()
+    assert (np.diff(values, axis=1) >= 0).all()
+    np.testing.assert_allclose(predictions['num_sold'], predictions['num_sold_p50'])
+    assert set(model.boosters) == {0.1, 0.5, 0.9}
+
+def test_report_includes_coverage(trained):
+    model, test_df = trained
+    report = model.evaluate_report(test_df, predictions=model.predict(test_df))
+    
+    coverage = report['quantiles']['per_quantile'].set_index('quantile')['coverage']
+    assert coverage.is_monotonic_increasing
+    assert report['quantiles']['interval']['nominal'] == pytest.approx(0.8)
+    assert 'mape' in report['overall']
+
+def test_save_load_round_trip(trained, quantile_config, tmp_path):
+    model, test_df = trained
+    path = str(tmp_path / 'model.txt')
+    model.save(path)
+    
+    loaded = ModelFactory.create_model(quantile_config)
+    loaded.load(path)
+    pd.testing.assert_frame_equal(loaded.predict(test_df), model.predict(test_df))
+    assert loaded.model_version == model.model_version
+
+def test_quantile_report():
+    y = np.array([1.0, 2.0, 3.0, 4.0])
+    preds = np.column_stack([y - 1, y + 1])
+    report = quantile_report(y, preds, [0.1, 0.9])
+    
+    assert report['per_quantile']['coverage'].tolist() == [0.0, 1.0]
+    assert report['interval']['coverage'] == 1.0
+    assert report['interval']['mean_width'] == 2.0
@@ -0,0 +1,88 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.reconciliation import HierarchyReconciler
+
+@pytest.fixture
+def reconciliation_config(sample_config):
+    sample_config['reconciliation'] = {'method': 'mint', 'weights': 'wls_struct'}
+    return sample_config
+
+def _assert_coherent(reconciler, data, hierarchy):
+    bottom = hierarchy[hierarchy['level'] == 'bottom']
+    for level in ['total'] + reconciler.levels:
+        nodes = hierarchy[hierarchy['level'] == level]
+        keys = ['date'] if level == 'total' else [level, 'date']
+        expected = bottom.groupby(keys)['num_sold'].sum()
+        actual = nodes.set_index(keys)['num_sold']
+        np.testing.assert_allclose(actual.sort_index(), expected.sort_index())
+
+def test_build_summing_matrix(reconciliation_config, sample_data):
+    reconciler = HierarchyReconciler(reconciliation_config)
+    bottom = sample_data[['country', 'store', 'product']].drop_duplicates().reset_index(drop=True)
+    summing, nodes = reconciler.build_summing_matrix(bottom)
+    
+    assert summing.shape == (1 + 3 + 3 + 3 + 27, 27)
+    assert summing.nnz == 27 * 5
+    assert len(nodes) == summing.shape[0]
+    assert summing[0].sum() == 27
+
+@pytest.mark.parametrize('method', ['bottom_up', 'top_down', 'mint'])
+def test_reconciled_forecasts_are_coherent(reconciliation_config, sample_data, method):
+    reconciliation_config['reconciliation']['method'] = method
+    reconciler = HierarchyReconciler(reconciliation_config)
+    reconciler.fit(sample_data)
+    
+    test_data = sample_data.iloc[-27 * 10:]
+    predictions = test_data['num_sold'].to_numpy() + 1.0
+    hierarchy, row_values = reconciler.reconcile_frame(test_data, predictions)
+    
+    assert len(hierarchy) == (1 + 3 + 3 + 3 + 27) * 10
+    assert len(row_values) == len(test_data)
+    _assert_coherent(reconciler, test_data, hierarchy)
+    if method == 'bottom_up':
+        np.testing.assert_allclose(row_values, predictions)
+
+def test_mint_moves_towards_aggregate_forecasts(reconciliation_config, sample_data):
+    reconciler = HierarchyReconciler(reconciliation_config)
+    test_data = sample_data.iloc[-27:]
+    predictions = np.ones(27)
+    
+    base_bottom, bottom, _, _, _ = reconciler.pivot(test_data, predictions)
+    summing, _ = reconciler.build_summing_matrix(bottom)
+    base_aggregates = summing[:-27] @ base_bottom
+    base_aggregates[0] = 54.0
+    reconciled = reconciler.reconcile(base_bottom, summing, bottom, base_aggregates)
+    
+    assert 27.0 < reconciled[0, 0] < 54.0
+    np.testing.assert_allclose(summing @ reconciled[-27:], reconciled)
+
+def test_mint_uses_aggregate_forecast_frame(reconciliation_config, sample_data):
+    reconciler = HierarchyReconciler(reconciliation_config)
+    test_data = sample_data.iloc[-27 * 2:]
+    predictions = np.ones(len(test_data))
+    
+    bottom_up, _ = HierarchyReconciler(reconciliation_config).reconcile_frame(test_data, predictions)
+    aggregate_forecasts = bottom_up[bottom_up['level'] != 'bottom'].copy()
+    total = aggregate_forecasts['level'] == 'total'
+    aggregate_forecasts.loc[total, 'num_sold'] = 54.0
+    # Nodes left out of the file fall back to their bottom-up sums
+    aggregate_forecasts = aggregate_forecasts[total | (aggregate_forecasts['level'] == 'country')]
+    
+    hierarchy, row_values = reconciler.reconcile_frame(test_data, predictions, aggregate_forecasts)
+    totals = hierarchy.loc[hierarchy['level'] == 'total', 'num_sold']
+    assert ((totals > 27.0) & (totals < 54.0)).all()
+    assert row_values.sum() == pytest.approx(totals.sum())
+    _assert_coherent(reconciler, test_data, hierarchy)
+
+def test_reconciliation_config_checks(sample_config):
+    from src.utils.config import Config, ConfigError
+    sample_config['reconciliation'] = {'enabled': True, 'method': 'mint'}
+    with pytest.raises(ConfigError):
+        Config.from_dict(sample_config)
+    
+    sample_config['reconciliation'] = {'enabled': True}
+    assert Config.from_dict(sample_config).reconciliation.method == 'bottom_up'
+    sample_config['prediction'] = {'mode': 'pipeline'}
+    with pytest.raises(ConfigError):
+        Config.from_dict(sample_config)
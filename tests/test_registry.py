@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+from src.models.registry import ModelRegistry, ModelWatcher, data_hash
+
+def _overrides(learning_rate):
+    return {'model.params.learning_rate': learning_rate, 'model.params.n_estimators': 10}
+
+def test_register_and_promote(trained_model, tmp_path):
+    model, _, _ = trained_model(_overrides(0.05))
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.current_version() is None
+    
+    version = registry.register(model, {'config_hash': 'abc', 'metrics': {'mape': 1.0}})
+    assert version == model.model_version
+    assert registry.register(model) == version
+    assert registry.metadata(version)['metrics'] == {'mape': 1.0}
+    assert not any(path.name.startswith('.') for path in (tmp_path / 'versions').iterdir())
+    
+    registry.promote(version)
+    assert registry.current_version() == version
+    assert registry.list_versions()['version'].tolist() == [version]
+
+def test_promote_unknown_version(tmp_path):
+    with pytest.raises(RuntimeError):
+        ModelRegistry(str(tmp_path)).promote('missing')
+
+def test_rollback(trained_model, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    first = registry.register(trained_model(_overrides(0.05))[0])
+    second = registry.register(trained_model(_overrides(0.2))[0])
+    third = registry.register(trained_model(_overrides(0.1))[0])
+    registry.promote(first)
+    registry.promote(second)
+    registry.promote(third)
+    
+    # Consecutive rollbacks walk back through the promotions instead of flipping
+    assert registry.rollback() == second
+    assert registry.rollback() == first
+    assert registry.current_version() == first
+    with pytest.raises(RuntimeError):
+        registry.rollback()
+    
+    registry.promote(third)
+    assert registry.rollback() == first
+
+def test_watcher_hot_swaps(sample_config, trained_model, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    first_model, _, df = trained_model(_overrides(0.05))
+    second_model, _, _ = trained_model(_overrides(0.2))
+    registry.promote(registry.register(first_model))
+    
+    watcher = ModelWatcher(ModelRegistry(str(tmp_path)), sample_config, poll_seconds=0)
+    test_df = df.iloc[8000:]
+    np.testing.assert_allclose(watcher.predict(test_df)['num_sold'], first_model.predict(test_df)['num_sold'])
+    
+    registry.promote(registry.register(second_model))
+    np.testing.assert_allclose(watcher.predict(test_df)['num_sold'], second_model.predict(test_df)['num_sold'])
+    assert watcher.version == second_model.model_version
+
+def test_data_hash(tmp_path):
+    path = tmp_path / 'train.csv'
+    path.write_text('a,b\n1,2\n')
+    first = data_hash(str(path))
+    path.write_text('a,b\n1,3\n')
+    
+    assert data_hash(str(path)) != first
@@ -0,0 +1,37 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.sharded_predict import ShardedPredictor
+
+@pytest.fixture
+def saved_model(trained_model, tmp_path):
+    model, _, data = trained_model()
+    model_path = tmp_path / "model.txt"
+    model.save(str(model_path))
+    return model, str(model_path), data.iloc[8000:]
+
+def test_make_shards(sample_config):
+    sample_config['prediction'] = {'shard_rows': 4}
+    shards = ShardedPredictor(sample_config).make_shards(10)
+    assert shards == [(0, 0, 4), (1, 4, 8), (2, 8, 10)]
+
+@pytest.mark.parametrize('output_format', ['parquet', 'feather'])
+def test_sharded_predictions_match_single_process(sample_config, saved_model, tmp_path, output_format):
+    model, model_path, test_data = saved_model
+    sample_config['prediction'] = {
+        'n_workers': 2,
+        'shard_rows': 300,
+        'output_format': output_format,
+        'output_dir': str(tmp_path / "predictions")
+    }
+    predictor = ShardedPredictor(sample_config)
+    paths = predictor.run(model_path, test_data)
+    assert len(paths) == int(np.ceil(len(test_data) / 300))
+    
+    output_path = tmp_path / "predictions.csv"
+    predictor.merge_to_csv(paths, str(output_path))
+    merged = pd.read_csv(output_path)
+    expected = model.predict(test_data)
+    
+    np.testing.assert_array_equal(merged['id'], expected['id'])
+    np.testing.assert_allclose(merged['num_sold'], expected['num_sold'], rtol=1e-6)
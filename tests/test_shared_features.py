@@ -0,0 +1,44 @@
+import pytest
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from src.data.shared_features import SharedFeatureMatrix, init_worker, get_worker_matrix
+from src.features.feature_engineer import FeatureEngineer
+
+def _column_sum(column: int) -> float:
+    return float(get_worker_matrix()['features'][:, column].sum())
+
+@pytest.mark.parametrize('backend', ['shared_memory', 'memmap'])
+def test_publish_and_attach(backend, tmp_path):
+    features = np.arange(12, dtype=np.float32).reshape(4, 3)
+    with SharedFeatureMatrix.publish({'features': features}, backend=backend, directory=str(tmp_path)) as matrix:
+        attached = SharedFeatureMatrix.attach(matrix.handle)
+        np.testing.assert_array_equal(attached['features'], features)
+        assert not attached['features'].flags.writeable
+        attached.close()
+    
+    if backend == 'memmap':
+        assert list(tmp_path.iterdir()) == []
+
+def test_publish_rejects_object_arrays():
+    with pytest.raises(ValueError):
+        SharedFeatureMatrix.publish({'ids': np.array(['a', 'b'], dtype=object)})
+
+def test_workers_share_matrix():
+    features = np.random.rand(100, 3).astype(np.float32)
+    with SharedFeatureMatrix.publish({'features': features}) as matrix:
+        with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(matrix.handle,)) as pool:
+            sums = list(pool.map(_column_sum, range(3)))
+    
+    np.testing.assert_allclose(sums, features.sum(axis=0), rtol=1e-5)
+
+def test_from_frame(sample_config, sample_data):
+    engineer = FeatureEngineer(sample_config)
+    data = engineer.create_features(sample_data)
+    
+    with SharedFeatureMatrix.from_frame(data, engineer, target_column='num_sold') as matrix:
+        assert set(matrix.arrays) == {'features', 'codes', 'target', 'days'}
+        assert len(matrix) == len(data)
+        assert matrix['codes'].shape == (len(data), 3)
+        np.testing.assert_array_equal(matrix['codes'][:, 0], data['country'].cat.codes.to_numpy())
+        np.testing.assert_array_equal(matrix['target'], data['num_sold'].to_numpy(dtype=np.float32))
@@ -0,0 +1,92 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.lightgbm_model import LightGBMModel
+from src.models.sharded_predict import ShardedPredictor
+from src.models.target_transform import TargetTransformFactory, load_target_transform
+
+@pytest.mark.parametrize('spec', [
+    {'name': 'none'},
+    {'name': 'log1p'},
+    {'name': 'series_mean'},
+    {'name': 'ratio_to_total'},
+    {'name': 'ratio_to_total', 'group_columns': ['country']}
+])
+def test_transform_round_trip(spec, sample_data):
+    y = sample_data['num_sold'].to_numpy(dtype=np.float64)
+    transform = TargetTransformFactory.create(spec).fit(sample_data, y)
+    scale = transform.scale(sample_data)
+    
+    restored = TargetTransformFactory.from_dict(transform.to_dict())
+    np.testing.assert_allclose(restored.inverse(transform.forward(y, scale), restored.scale(sample_data)), y)
+
+def test_series_mean_scales(sample_data):
+    y = sample_data['num_sold'].to_numpy(dtype=np.float64)
+    transform = TargetTransformFactory.create({'name': 'series_mean'}).fit(sample_data, y)
+    
+    first = sample_data.iloc[:1]
+    mask = (
+        (sample_data['country'] == first['country'].iloc[0]) &
+        (sample_data['store'] == first['store'].iloc[0]) &
+        (sample_data['product'] == first['product'].iloc[0])
+    )
+    assert transform.scale(first)[0] == pytest.approx(y[mask.to_numpy()].mean())
+
+def test_ratio_to_total_default_groups(sample_data):
+    y = sample_data['num_sold'].to_numpy(dtype=np.float64)
+    transform = TargetTransformFactory.create({'name': 'ratio_to_total'}).fit(sample_data, y)
+    
+    assert transform.group_columns == ['country', 'store']
+    assert len(np.unique(transform.scale(sample_data))) == 9
+    first = sample_data.iloc[:1]
+    store = (sample_data['country'] == first['country'].iloc[0]) & (sample_data['store'] == first['store'].iloc[0])
+    daily = sample_data[store.to_numpy()].groupby('date')['num_sold'].sum()
+    assert transform.scale(first)[0] == pytest.approx(daily.mean())
+
+def test_unknown_transform():
+    with pytest.raises(ValueError):
+        TargetTransformFactory.create({'name': 'unknown'})
+
+def test_model_persists_transform(sample_config, trained_model, tmp_path):
+    model, _, data = trained_model({'model.target_transform': {'name': 'series_mean'}})
+    expected = model.predict(data.iloc[8000:])
+    
+    model_path = str(tmp_path / "model.txt")
+    model.save(model_path)
+    assert load_target_transform(model_path).name == 'series_mean'
+    
+    sample_config['model']['target_transform'] = {'name': 'none'}
+    loaded = LightGBMModel(sample_config)
+    loaded.load(model_path)
+    np.testing.assert_allclose(loaded.predict(data.iloc[8000:])['num_sold'], expected['num_sold'])
+    
+    sample_config['prediction'] = {'n_workers': 2, 'shard_rows': 500, 'output_dir': str(tmp_path / "shards")}
+    paths = ShardedPredictor(sample_config).run(model_path, data.iloc[8000:])
+    sharded = pd.concat([pd.read_parquet(path) for path in paths])
+    np.testing.assert_allclose(sharded['num_sold'], expected['num_sold'], rtol=1e-6)
+
+def test_array_training_rejects_frame_transforms(sample_config):
+    sample_config['model']['target_transform'] = {'name': 'series_mean'}
+    model = LightGBMModel(sample_config)
+    X = np.random.rand(10, 9)
+    
+    with pytest.raises(RuntimeError):
+        model.train_arrays(X, np.ones(10), X, np.ones(10))
+
+def test_early_stopping_metric_in_original_space(sample_config):
+    import lightgbm as lgb
+    sample_config['model']['params']['metric'] = 'mape'
+    sample_config['model']['target_transform'] = {'name': 'log1p'}
+    model = LightGBMModel(sample_config)
+    y_val = np.array([10.0, 20.0, 40.0])
+    model._validation_target = (y_val, None)
+    val_dataset = lgb.Dataset(np.zeros((3, 1)), label=np.log1p(y_val))
+    
+    feval = model._original_space_feval(model._booster_params(), val_dataset)
+    name, value, higher_better = feval(np.log1p(y_val * 1.1), val_dataset)[0]
+    assert (name, higher_better) == ('mape', False)
+    assert value == pytest.approx(10.0)
+    assert feval(np.log1p(y_val), lgb.Dataset(np.zeros((3, 1)))) == []
+    
+    sample_config['model']['target_transform'] = {'name': 'none'}
+    assert LightGBMModel(sample_config)._original_space_feval(model._booster_params(), val_dataset) is None